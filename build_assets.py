@@ -0,0 +1,33 @@
+import argparse
+import os
+import time
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame as pg
+from config import *
+from controller.file_path import get_resource_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pre-scale the GUI images into one bundle for a fast start")
+    parser.add_argument("--output", help=f"bundle file (default: {ASSET_BUNDLE_FILE} next to main.py)")
+    args = parser.parse_args()
+
+    # A display mode is needed for convert(), the dummy driver never opens a window
+    pg.display.init()
+    pg.display.set_mode((1, 1))
+
+    from view.asset_bundle import build_bundle
+
+    bundle_path = args.output or get_resource_path(ASSET_BUNDLE_FILE)
+    start = time.perf_counter()
+    variants, size = build_bundle(bundle_path)
+    print(f"Wrote {variants} images ({size / 1e6:.1f} MB) to {bundle_path} in {time.perf_counter() - start:.2f}s")
+
+    pg.quit()
+
+
+if __name__ == "__main__":
+    main()
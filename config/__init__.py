@@ -1,4 +1,6 @@
 from .sizes import *
 from .colors import *
 from .testing import *
-from .logic_constants import *
\ No newline at end of file
+from .logic_constants import *
+from .engine_settings import *
+from .openings import *
\ No newline at end of file
@@ -10,4 +10,6 @@ BLACK_SQUARE_COLOR = (181, 136, 99)
 RED = (255, 0, 0)
 HIGHLIGHT_COLOR = (255, 102, 102)
 
-BACKGROUND_COLOR = (240, 240, 240)
\ No newline at end of file
+BACKGROUND_COLOR = (240, 240, 240)
+PROMOTION_OVERLAY_COLOR = (0, 0, 0, 30) # Dims the window while a promotion piece is chosen
+CHROME_COLOR_KEY = (255, 0, 255) # Transparent in pre-rendered frames, never drawn by the frames themselves
@@ -0,0 +1,29 @@
+# engine pool
+ENGINE_POOL_SIZE = None # None means one worker per CPU core
+
+ENGINE_WORKER_STOPPED = 0
+ENGINE_WORKER_STARTING = 1
+ENGINE_WORKER_IDLE = 2
+ENGINE_WORKER_BUSY = 3
+ENGINE_WORKER_CHECKED_OUT = 4
+ENGINE_WORKER_DEAD = 5
+
+# pondering: think on the human's clock about the expected reply
+PONDER_ENABLED = True
+
+# analysis cache: reuse results for positions that were already searched
+ANALYSIS_CACHE_SIZE = 20000 # positions kept before the least recently used is evicted
+ANALYSIS_CACHE_MIN_DEPTH = 12 # cached result is played only if it was searched at least this deep
+
+# evaluation store: finished searches saved on disk and shared between sessions
+EVALUATION_STORE_FILE = "evaluations.sqlite3" # relative to the GUI folder, None disables it
+EVALUATION_STORE_TIMEOUT = 5.0 # seconds a writer waits for another process holding the lock
+EVALUATION_STORE_READ_TIMEOUT = 0.05 # seconds a lookup waits, it runs on the GUI thread and a miss is cheap
+
+# opening book: polyglot .bin file consulted before the engine is asked
+BOOK_FILE = "books/book.bin" # relative to the GUI folder, None disables it
+BOOK_MAX_PLY = 16 # the book is not used after this many half moves
+
+# syzygy tablebases: perfect play and adjudication once few pieces are left
+SYZYGY_PATH = "syzygy" # folder with .rtbw/.rtbz files relative to the GUI folder, None disables it
+SYZYGY_ADJUDICATE = True # end the game as soon as the tablebase result is known
@@ -9,6 +9,10 @@ TIME_PASSED_BLACK = 6
 GAME_PAUSED = 7
 ENGINE_ILLEGAL_MOVE = 8
 THREEFOLD_REPETITION = 9
+TABLEBASE_WIN_WHITE = 10
+TABLEBASE_WIN_BLACK = 11
+TABLEBASE_DRAW = 12
+ENGINE_NOT_STARTED = 13
 
 TIME_1_MUNUTES = 60
 TIME_5_MINUTES = 5 * 60
@@ -19,4 +23,11 @@ MOVES_TO_GO_BLITZ = 80
 
 BUTTON_START = "button_2.png"
 BUTTON_STOP = "button_2.png"
-DEFAULT_BUTTON = "button.png"
\ No newline at end of file
+DEFAULT_BUTTON = "button.png"
+
+# minutes -> (clock in seconds, moves to go), same pairs as the GUI time buttons
+TIME_CONTROLS = {
+    1: (TIME_1_MUNUTES, MOVES_TO_GO_BLITZ),
+    5: (TIME_5_MINUTES, MOVES_TO_GO_DEFAULT),
+    10: (TIME_10_MINUTES, MOVES_TO_GO_DEFAULT),
+}
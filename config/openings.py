@@ -0,0 +1,22 @@
+# Short opening lines (SAN) used by the headless match runner for game variety.
+# Every line is played twice, once with each engine as white.
+OPENING_SUITE = [
+    "e4 e5 Nf3 Nc6 Bb5 a6",          # Ruy Lopez
+    "e4 e5 Nf3 Nc6 Bc4 Bc5",         # Italian
+    "e4 c5 Nf3 d6 d4 cxd4 Nxd4 Nf6", # Sicilian
+    "e4 c5 Nc3 Nc6 g3 g6",           # Closed Sicilian
+    "e4 e6 d4 d5 Nc3 Nf6",           # French
+    "e4 c6 d4 d5 e5 Bf5",            # Caro-Kann Advance
+    "e4 d5 exd5 Qxd5 Nc3 Qa5",       # Scandinavian
+    "e4 Nf6 e5 Nd5 d4 d6",           # Alekhine
+    "d4 d5 c4 e6 Nc3 Nf6",           # Queen's Gambit Declined
+    "d4 d5 c4 c6 Nf3 Nf6",           # Slav
+    "d4 d5 c4 dxc4 Nf3 Nf6",         # Queen's Gambit Accepted
+    "d4 Nf6 c4 g6 Nc3 Bg7 e4 d6",    # King's Indian
+    "d4 Nf6 c4 e6 Nc3 Bb4",          # Nimzo-Indian
+    "d4 Nf6 c4 c5 d5 b5",            # Benko Gambit
+    "d4 f5 g3 Nf6 Bg2 e6",           # Dutch
+    "c4 e5 Nc3 Nf6 g3 d5",           # English
+    "Nf3 d5 g3 Nf6 Bg2 c6",          # Reti
+    "e4 g6 d4 Bg7 Nc3 d6",           # Modern
+]
@@ -1,5 +1,6 @@
 # screen
 FPS = 60
+IDLE_MAX_WAIT_MS = 1000 # Longest sleep of the main loop while nothing moves on the screen
 
 SCREEN_WIDTH = 1500 # Extra space for UI elements
 SCREEN_HEIGHT = SCREEN_WIDTH - 600
@@ -14,6 +15,7 @@ GAP_SQAURE =  SQUARE_SIZE * 0.05 # Gap between squares
 BOARD_X = 3 * SCREEN_WIDTH // 10 - BOARD_WIDTH // 2 
 BOARD_Y = (SCREEN_HEIGHT - BOARD_HEIGHT) // 2
 PIECE_SIZE = int(SQUARE_SIZE * 0.9)  # Leave some padding around pieces
+BOARD_MARGIN = 22 # White frame around the board, files and ranks are written on it
 
 
 
@@ -115,4 +117,22 @@ GAME_STATUS_Y = TIME_INFO_Y + TIME_INFO_HEIGHT + GAP_INFO
 SEARCH_INFO_X = TIME_INFO_X
 SEARCH_INFO_WIDTH = TIME_INFO_WIDTH
 SEARCH_INFO_Y = GAME_STATUS_Y + GAME_STATUS_HEIGHT + GAP_INFO
-SEARCH_INFO_HEIGHT = PLAY_BUTTON_Y - SEARCH_INFO_Y - 2 * GAP_INFO
\ No newline at end of file
+SEARCH_INFO_HEIGHT = PLAY_BUTTON_Y - SEARCH_INFO_Y - 2 * GAP_INFO
+
+# text rendering caches
+TEXT_CACHE_SIZE = 512 # rendered text surfaces shared by all views
+PV_WRAP_CACHE_SIZE = 32 # principle variations already split into lines
+
+# pre-scaled images written by build_assets.py, loaded on start when it matches the sizes above
+ASSET_BUNDLE_FILE = "assets.bundle"
+
+# profiler overlay (F3 toggles it, F4 writes a Chrome trace)
+PROFILER_CAPACITY = 20000 # timed stages kept in the ring buffer
+PROFILER_REFRESH = 0.5 # seconds between overlay updates
+PROFILER_OVERLAY_X = 10
+PROFILER_OVERLAY_Y = 5
+PROFILER_OVERLAY_WIDTH = SCREEN_WIDTH - 2 * PROFILER_OVERLAY_X
+PROFILER_OVERLAY_HEIGHT = BOARD_Y - BOARD_MARGIN - 10 # strip above the board and the clocks
+
+# mouse events are routed through a grid of hit regions
+HIT_TEST_CELL_SIZE = 64 # pixels per grid cell, a region is listed in every cell it touches
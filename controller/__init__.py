@@ -1,2 +1,3 @@
 from .board_controller import BoardController
 from .file_path import get_resource_path
+from .engine_pool import EnginePool
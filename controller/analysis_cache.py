@@ -0,0 +1,100 @@
+import chess.polyglot
+import threading
+from collections import OrderedDict
+from config import *
+
+
+class CachedAnalysis:
+    def __init__(self, score, depth, principle_variation, best_move):
+        self.score = score # chess.engine.PovScore
+        self.depth = depth
+        self.principle_variation = principle_variation
+        self.best_move = best_move
+
+    def as_info(self):
+        """ Same shape as the engine's InfoDict, so SearchInfo.update and batch callers can use it """
+        return {"score": self.score, "depth": self.depth, "pv": list(self.principle_variation)}
+
+
+class AnalysisCache:
+    """
+    Bounded LRU cache of finished searches keyed by the polyglot Zobrist hash.
+    A cached result is reused only if it was searched at least as deep as requested.
+    Memory misses fall back to the optional on-disk EvaluationStore.
+    Shared between the GUI engine and the pool, so every method is thread-safe.
+    """
+    def __init__(self, max_size=ANALYSIS_CACHE_SIZE, store=None):
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.cache_lock = threading.Lock()
+        self.store = store
+
+        self.hits = 0
+        self.store_hits = 0
+        self.misses = 0
+
+    def get(self, board, min_depth=0):
+        key = chess.polyglot.zobrist_hash(board)
+        with self.cache_lock:
+            entry = self.entries.get(key)
+            if entry is not None and entry.depth >= min_depth:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return entry
+
+        if self.store is not None:
+            entry = self.store.get(board, min_depth)
+            if entry is not None:
+                with self.cache_lock:
+                    self._remember(key, entry)
+                    self.store_hits += 1
+                return entry
+
+        with self.cache_lock:
+            self.misses += 1
+        return None
+
+    def _remember(self, key, entry):
+        self.entries[key] = entry
+        self.entries.move_to_end(key)
+
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+    def put(self, board, score, depth, principle_variation, best_move):
+        if depth is None or best_move is None:
+            return
+
+        key = chess.polyglot.zobrist_hash(board)
+        with self.cache_lock:
+            old_entry = self.entries.get(key)
+            if old_entry is not None and old_entry.depth > depth:
+                # Keep the deeper result, but mark it as recently used
+                self.entries.move_to_end(key)
+                return
+
+            self._remember(key, CachedAnalysis(score, depth, tuple(principle_variation or ()), best_move))
+
+        if self.store is not None:
+            self.store.put(board, score, depth, principle_variation, best_move)
+
+    def put_info(self, board, info):
+        """ Store an engine InfoDict, the best move is the first PV move """
+        pv = info.get("pv")
+        self.put(board, info.get("score"), info.get("depth"), pv, pv[0] if pv else None)
+
+    def stats(self):
+        with self.cache_lock:
+            lookups = self.hits + self.store_hits + self.misses
+            return {
+                "hits": self.hits,
+                "store_hits": self.store_hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits + self.store_hits) / lookups if lookups else 0.0,
+                "size": len(self.entries),
+                "max_size": self.max_size,
+            }
+
+    def clear(self):
+        with self.cache_lock:
+            self.entries.clear()
@@ -1,18 +1,40 @@
 import chess
-import chess.engine as engine
+import chess.engine
+import concurrent.futures
 import os
-import pygame as pg
-import threading
+import sqlite3
 import time
-import sys
 from config import *
-from .search_info import SearchInfo
+from .search_info import SearchInfo, SearchInfoPublisher
 from .move_animation import MoveAnimation
-from .file_path import get_resource_path
+from .file_path import get_resource_path, get_engine_path
+from .engine_pool import EnginePool
+from .engine_driver import EngineDriver
+from .analysis_cache import AnalysisCache
+from .evaluation_store import EvaluationStore
+from .game_rules import get_game_status
+from .opening_book import OpeningBook
+from .tablebase import Tablebase
+from .move_index import LegalMoveIndex
+from .position_tracker import PositionTracker
+from .startup_timeline import StartupTimeline
+from .profiler import ProfiledLock
+from .game_state import GameState
 
 class BoardController:
-    def __init__(self):
-        pg.mixer.init()
+    def __init__(self, wait_for_engine=True, timeline=None, sounds=None, animation_factory=MoveAnimation):
+        """
+        wait_for_engine=False returns before the UCI handshake is done, the board can be used
+        right away and the engine starts playing once it is ready. timeline records startup stages.
+        The controller never imports pygame, the GUI passes its adapters:
+        sounds has play_move(), play_capture() and play_notification(), None plays nothing.
+        animation_factory(piece_symbol, start_pos, end_pos) animates the moves, instant_animation
+        finishes them on the next procces_animation_and_push_move call.
+        """
+        self.timeline = timeline or StartupTimeline()
+        self.on_update = None # Called from engine threads when something on the screen changed
+        self.sounds = sounds
+        self.animation_factory = animation_factory
 
         fen = chess.STARTING_FEN
         # fen = check_fen  # For testing purposes
@@ -25,8 +47,19 @@ class BoardController:
         # fen = white_rook_only
         # fen = black_rook_only
         self.board = chess.Board(fen)
+        self.move_index = LegalMoveIndex(self.board)
+        self.position_tracker = PositionTracker(self.board)
         self.engine = None
-        self.load_engine()
+        self.engine_pool = None
+        self.engine_start = None
+        self.is_engine_failed = False # Set by the engine thread when the handshake failed
+        with self.timeline.stage("evaluation store"):
+            self.analysis_cache = AnalysisCache(store=self.open_evaluation_store())
+        # Spawn the engine first, everything below runs during its handshake
+        self.load_engine(wait_for_engine)
+        with self.timeline.stage("book and tablebases"):
+            self.opening_book = self.open_opening_book()
+            self.tablebase = self.open_tablebase()
 
         self.white_on_bottom = True # Default orientation
 
@@ -34,7 +67,7 @@ class BoardController:
         self.legal_moves_for_source_square = []
 
         self.is_engine_thinking = False
-        self.current_analysis = None
+        self.current_search = None
         self.is_force_quit_engine = False
 
         self.is_promoting = False
@@ -52,20 +85,13 @@ class BoardController:
 
         self.game_status = GAME_PAUSED
 
-        self.absent_pices_num = {
-            'P': 0, 'N': 0, 'B': 0, 'R': 0, 'Q': 0, 'K': 0,
-            'p': 0, 'n': 0, 'b': 0, 'r': 0, 'q': 0, 'k': 0
-        }
-
+        self.absent_pices_num = {}
         self.get_absent_pieces()
 
-        self.move_sound = pg.mixer.Sound(get_resource_path(os.path.join("sounds", "move.mp3")))
-        self.capture_sound = pg.mixer.Sound(get_resource_path(os.path.join("sounds", "capture.mp3")))
-        self.generic_notification_sound = pg.mixer.Sound(get_resource_path(os.path.join("sounds", "generic_notification.mp3")))
-
-        self.search_info = SearchInfo()
+        # Engine thread publishes snapshots here, views read them without board_lock
+        self.search_info_publisher = SearchInfoPublisher(on_publish=self.notify_update)
 
-        self.board_lock = threading.Lock()
+        self.board_lock = ProfiledLock("board_lock") # Records lock waits and hold times while profiling
 
         # for pices moving animation
         self.active_animation = None
@@ -80,48 +106,100 @@ class BoardController:
         }
 
         self.current_search_id = 0
+        self.ponder_move = None # Expected human reply the engine is pondering on
+        # search_id -> SearchInfo of that search alone, only touched by the engine driver thread
+        self.search_results = {}
+
+        # Views draw the latest snapshot without taking board_lock
+        self.game_state = None
+        self.publish_state()
+
+    def load_engine(self, wait=True):
+        engine_path = get_engine_path()
+
+        # The playing engine lives on one long-lived asyncio loop
+        self.engine = EngineDriver(engine_path)
+        start = self.timeline.now()
+        self.engine_start = self.engine.start()
+        self.engine_start.add_done_callback(lambda future: self.on_engine_started(future, engine_path, start))
+        if wait:
+            self.engine_start.result()
+
+        # Workers for extra analysis start lazily, on the first submitted position
+        self.engine_pool = EnginePool(engine_path, cache=self.analysis_cache)
+
+    def on_engine_started(self, future, engine_path, start):
+        """ Runs on the engine's loop thread once the UCI handshake finished or failed """
+        self.timeline.add("engine handshake", start, self.timeline.now())
+        if future.cancelled():
+            return # Closed during the handshake
+        if future.exception() is not None:
+            print(f"Could not start engine {engine_path}: {future.exception()}")
+            # engine_make_move ends the game on the engine's turn, instead of waiting for it forever
+            self.is_engine_failed = True
+            self.notify_update()
+            return
+        print(f"Loaded engine from: {engine_path}")
+        self.notify_update()
 
-    def load_engine(self):
-        # Choose the filename based on the OS
-        if os.name == 'nt':  # Windows (or Wine)
-            engine_file = 'cincinnatus_windows_release.exe'
-        else:  # Linux / MacOS
-            engine_file = 'cincinnatus_linux_release'
+    def open_evaluation_store(self):
+        if EVALUATION_STORE_FILE is None:
+            return None
 
-        # Use your helper function to find the exact path
-        # We join 'engines' and the filename
-        relative_engine_path = os.path.join('engines', engine_file)
-        engine_path = get_resource_path(relative_engine_path)
+        store_path = get_resource_path(EVALUATION_STORE_FILE)
+        try:
+            return EvaluationStore(store_path)
+        except sqlite3.Error as e:
+            # The GUI still works, searches are just not remembered between sessions
+            print(f"Could not open evaluation store at {store_path}: {e}")
+            return None
 
-        # Double-check the file exists to prevent a silent crash
-        if not os.path.exists(engine_path):
-            raise FileNotFoundError(f"Engine not found at: {engine_path}")
+    def open_opening_book(self):
+        if BOOK_FILE is None:
+            return None
 
-        # 4. Start the engine
-        self.engine = engine.SimpleEngine.popen_uci(engine_path)
-        print(f"Loaded engine from: {engine_path}")
+        book_path = get_resource_path(BOOK_FILE)
+        if not os.path.exists(book_path):
+            return None
 
-    def is_left_mouse_button_down(self, event):
-        return event.type == pg.MOUSEBUTTONDOWN and event.button == 1
+        try:
+            book = OpeningBook(book_path)
+        except OSError as e:
+            print(f"Could not open opening book at {book_path}: {e}")
+            return None
 
-    def get_square_from_mouse_pos(self, mouse_pos):
-        x, y = mouse_pos
-        file = (x - BOARD_X) // SQUARE_SIZE
-        rank = 7 - ((y - BOARD_Y) // SQUARE_SIZE)  # Invert y-axis for chess board
-        if not self.white_on_bottom:
-            file = 7 - file
-            rank = 7 - rank
-        
-        if(file < 0 or file > 7 or rank < 0 or rank > 7):
+        print(f"Loaded opening book from: {book_path}")
+        return book
+
+    def open_tablebase(self):
+        if SYZYGY_PATH is None:
             return None
 
-        return chess.square(file, rank)
+        tablebase_path = get_resource_path(SYZYGY_PATH)
+        if not os.path.isdir(tablebase_path):
+            return None
+
+        tablebase = Tablebase(tablebase_path)
+        if tablebase.max_pieces == 0:
+            tablebase.close()
+            return None
+
+        print(f"Loaded {tablebase.max_pieces}-piece tablebases from: {tablebase_path}")
+        return tablebase
+
+    def submit_analysis(self, board, limit):
+        """ Analyse a position on a free pool worker, the playing engine is not disturbed """
+        return self.engine_pool.submit(board, limit)
+
+    def push_move(self, move):
+        """ Every move of the game goes through here. Caller must hold board_lock """
+        self.position_tracker.push(move)
+        self.move_index.invalidate()
 
     def get_legal_moves_for_source_square(self):
         self.legal_moves_for_source_square = []
         if self.source_square is not None:
-            all_legal_moves = list(self.board.legal_moves)
-            self.legal_moves_for_source_square = [move for move in all_legal_moves if move.from_square == self.source_square]
+            self.legal_moves_for_source_square = self.move_index.moves_from(self.source_square)
 
     def is_promotion(self, move):
         piece = self.board.piece_at(move.from_square)
@@ -143,7 +221,40 @@ class BoardController:
         y = BOARD_Y + (7 - rank) * SQUARE_SIZE
         return x, y
 
-    def handle_click(self, event, mouse_pos):
+    def publish_state(self):
+        """
+        Swap in a new GameState for the views. The GUI loop calls it once per frame after its own
+        changes, the engine thread after it changed the game. board_lock is held only for the copy
+        """
+        with self.board_lock:
+            self.game_state = GameState(self, self.game_state)
+
+    @property
+    def search_info(self):
+        """ Latest published snapshot of the engine's search """
+        return self.search_info_publisher.latest
+
+    def start_move_animation(self, move):
+        """ Animate the move, it is pushed when the animation ends. Caller must hold board_lock """
+        start_px = self.get_square_coords(move.from_square)
+        end_px = self.get_square_coords(move.to_square)
+        piece = self.board.piece_at(move.from_square)
+
+        if piece:
+            self.active_animation = self.animation_factory(piece.symbol(), start_px, end_px)
+            self.pending_move = move
+
+            # Castling logic: Setup the Rook animation
+            if self.board.is_castling(move):
+                r_from, r_to = self.castle_map[move.to_square]
+                r_start_px = self.get_square_coords(r_from)
+                r_end_px = self.get_square_coords(r_to)
+                r_piece = self.board.piece_at(r_from)
+                if r_piece:
+                    self.secondary_animation = self.animation_factory(r_piece.symbol(), r_start_px, r_end_px)
+
+    def handle_click(self, square):
+        """ Left mouse button pressed over the square """
         # Thread-Safe State Check
         # We lock here to check if the game is active and if it's the human's turn.
         with self.board_lock:
@@ -158,17 +269,9 @@ class BoardController:
                 return
 
             # Peek at the board state while still inside the lock
-            square = self.get_square_from_mouse_pos(mouse_pos)
-            if square is None:
-                return
-
             piece_at_square = self.board.piece_at(square)
             current_turn = self.board.turn
 
-        # UI Event Check (Lock not needed for local event processing)
-        if not self.is_left_mouse_button_down(event):
-            return
-
         # State Machine Logic
         if self.source_square is None:
             # Selecting a piece
@@ -197,22 +300,7 @@ class BoardController:
                     if self.board.turn != current_turn:
                         return
 
-                    start_px = self.get_square_coords(move_to_make.from_square)
-                    end_px = self.get_square_coords(move_to_make.to_square)
-                    piece = self.board.piece_at(move_to_make.from_square)
-
-                    if piece:
-                        self.active_animation = MoveAnimation(piece.symbol(), start_px, end_px)
-                        self.pending_move = move_to_make
-
-                        # Castling logic: Setup the Rook animation
-                        if self.board.is_castling(move_to_make):
-                            r_from, r_to = self.castle_map[move_to_make.to_square]
-                            r_start_px = self.get_square_coords(r_from)
-                            r_end_px = self.get_square_coords(r_to)
-                            r_piece = self.board.piece_at(r_from)
-                            if r_piece:
-                                self.secondary_animation = MoveAnimation(r_piece.symbol(), r_start_px, r_end_px)
+                    self.start_move_animation(move_to_make)
 
                 self.legal_moves_for_source_square = []
                 if not self.is_promoting:
@@ -223,18 +311,9 @@ class BoardController:
                     self.source_square = square
                     self.get_legal_moves_for_source_square()
 
-    def choose_promotion_piece(self, event, mouse_pos):
-        # 1. Early Exit for Input (No lock needed for mouse button check)
-        if not self.is_left_mouse_button_down(event):
-            return
-
-        # 2. Coordinate Check (UI only)
-        x, y = mouse_pos
-        if not (PROMOTION_TABLE_X <= x <= PROMOTION_TABLE_X + PROMOTION_TABLE_WIDTH and
-                PROMOTION_TABLE_Y <= y <= PROMOTION_TABLE_Y + PROMOTION_TABLE_CELL_WIDTH):
-            return
-
-        # 3. Critical State Check
+    def choose_promotion_piece(self, selected_piece):
+        """ Left mouse button pressed over the promotion cell of selected_piece (chess.QUEEN, ...) """
+        # 1. Critical State Check
         with self.board_lock:
             # Check if it's actually the human's turn
             is_human_turn = (self.white_on_bottom and self.board.turn == chess.WHITE) or \
@@ -243,15 +322,6 @@ class BoardController:
             if not is_human_turn or not self.is_promoting or self.game_status != PLAYING:
                 return
 
-            # Map click to piece
-            piece_index = int((x - PROMOTION_TABLE_X) // PROMOTION_TABLE_CELL_WIDTH)
-            promo_pieces = [chess.QUEEN, chess.ROOK, chess.KNIGHT, chess.BISHOP]
-
-            if 0 <= piece_index < len(promo_pieces):
-                selected_piece = promo_pieces[piece_index]
-            else:
-                return
-
             if self.pending_move:
                 # Construct the move with the chosen piece
                 final_move = chess.Move(
@@ -260,13 +330,14 @@ class BoardController:
                     promotion=selected_piece
                 )
 
-                # 4. Finalize Move (Already inside the lock)
-                if final_move in self.board.legal_moves:
+                # 2. Finalize Move (Already inside the lock)
+                if self.move_index.is_legal(final_move):
                     is_capture = self.board.is_capture(final_move)
-                    self.board.push(final_move)
+                    self.push_move(final_move)
 
                     # Update status (Checkmate/Stalemate/Time)
                     self.update_game_status()
+                    self.resolve_ponder(final_move)
 
                     # Visual/Sound updates
                     self.play_sound(is_capture)
@@ -274,7 +345,7 @@ class BoardController:
                     self.source_square_display = final_move.from_square
                     self.target_square_display = final_move.to_square
 
-                    # 5. Cleanup Shared UI state
+                    # 3. Cleanup Shared UI state
                     self.active_animation = None
                     self.pending_move = None
                     self.source_square = None
@@ -300,86 +371,186 @@ class BoardController:
                 self.pending_move is not None):
                 return
 
+            if self.is_engine_failed:
+                self.game_status = ENGINE_NOT_STARTED
+                return
+
+            # Book moves are played without asking the engine at all
+            if self.opening_book is not None:
+                book_move = self.opening_book.choose_move(self.board)
+                if book_move is not None:
+                    self.reset_search_info()
+                    self.start_move_animation(book_move)
+                    return
+
+            # Solved endgames are played perfectly without a search
+            if self.tablebase is not None:
+                tablebase_move = self.tablebase.best_move(self.board)
+                if tablebase_move is not None:
+                    self.reset_search_info()
+                    self.start_move_animation(tablebase_move)
+                    return
+
+            # Positions searched deep enough before are played straight from the cache
+            cached = self.analysis_cache.get(self.board, ANALYSIS_CACHE_MIN_DEPTH)
+            if cached is not None and self.move_index.is_legal(cached.best_move):
+                self.reset_search_info(SearchInfo().updated(cached.as_info()))
+                self.start_move_animation(cached.best_move)
+                return
+
+            # Still in the UCI handshake, try again on one of the next frames
+            if not self.engine.is_ready():
+                return
+
             # SETUP SEARCH (Still inside the lock)
             self.current_search_id = time.time()
             search_id = self.current_search_id
             board_copy = self.board.copy()
             self.is_engine_thinking = True
+            self.reset_search_info()
+
+            # The search runs on the driver's event loop, no thread is created per move
+            search = self.engine.search(
+                board_copy, self.time_limit,
+                on_info=lambda info: self.on_engine_info(info, search_id))
+            self.current_search = search
+
+        search.add_done_callback(
+            lambda future: self.on_engine_result(future, board_copy, search_id))
+
+    def cancel_search(self):
+        """ Stop the running search immediately. Caller must hold board_lock """
+        if self.current_search is not None:
+            self.current_search.cancel()
+            self.current_search = None
+        self.current_search_id = 0  # Results of the stopped search are ignored
+        self.ponder_move = None
+
+    def start_pondering(self, engine_move):
+        """ Search the expected human reply on the human's clock. Caller must hold board_lock """
+        if not PONDER_ENABLED or self.engine is None or not self.engine.is_ready() or self.game_status != PLAYING:
+            return
+
+        # The expected reply is the second move of the PV that produced engine_move
+        pv = self.search_info.principle_variation
+        if not pv or len(pv) < 2 or pv[0] != engine_move:
+            return
 
-        # Start the thread OUTSIDE the lock to keep UI responsive
-        thread = threading.Thread(target=self.run_engine, args=(board_copy, search_id))
-        thread.daemon = True
-        thread.start()
+        expected_reply = pv[1]
+        if not self.move_index.is_legal(expected_reply):
+            return
 
-    def run_engine(self, board_copy, search_id):
-        """ Runs in background thread with a thread-safe board snapshot """
+        ponder_board = self.board.copy()
+        ponder_board.push(expected_reply)
+        if ponder_board.is_game_over():
+            return
+
+        self.current_search_id = time.time()
+        search_id = self.current_search_id
+        self.ponder_move = expected_reply
+        self.reset_search_info()
+
+        # No limit: it runs until the human moves (ponderhit or stop)
+        search = self.engine.search(
+            ponder_board, None,
+            on_info=lambda info: self.on_engine_info(info, search_id))
+        self.current_search = search
+        search.add_done_callback(
+            lambda future: self.on_engine_result(future, ponder_board, search_id))
+
+    def resolve_ponder(self, human_move):
+        """ Called after the human's move is pushed. Caller must hold board_lock """
+        if self.ponder_move is None:
+            return
+
+        if human_move == self.ponder_move and self.current_search is not None and self.game_status == PLAYING:
+            # Ponderhit: the running search becomes the engine's real search,
+            # limited to the time the engine would get per move on its own clock
+            engine_clock = self.white_clock if self.board.turn == chess.WHITE else self.black_clock
+            self.current_search.ponderhit(engine_clock / self.moves_to_go)
+            self.is_engine_thinking = True
+            self.ponder_move = None
+        else:
+            # Wrong guess, engine_make_move starts a fresh search
+            self.cancel_search()
+
+    def reset_search_info(self, search_info=None):
+        """
+        Show a new search snapshot. The engine driver thread pushes the info lines, so the reset
+        runs there too: lines of a cancelled search that were already pushed are dropped with it
+        """
+        if self.engine is not None:
+            def reset():
+                self.search_info_publisher.reset(search_info)
+                self.notify_update()
+            self.engine.call_soon(reset)
+        else:
+            self.search_info_publisher.reset(search_info)
+
+    def on_engine_info(self, info, search_id):
+        """ Runs on the engine driver thread for every info line, board_lock is not needed """
+        if self.current_search_id == search_id:
+            self.search_info_publisher.push(info)
+            self.search_results[search_id] = self.search_results.get(search_id, SearchInfo()).updated(info)
+
+    def on_engine_result(self, future, board_copy, search_id):
+        """ Runs on the engine driver thread once the search has finished """
         try:
-            if not self.engine:
-                return
-            
+            result = future.result()
+
+            search_result = None
             with self.board_lock:
                 if self.is_force_quit_engine or self.game_status != PLAYING:
+                    print("The game is terminated.")
+                    return
+
+                if self.current_search_id != search_id:
+                    print("Old analysis terminated.")
+                    return
+
+                # Lines merged since the last frame belong to the finished search
+                self.search_info_publisher.flush()
+
+                if self.ponder_move is not None:
+                    # Ponder search ended before the human moved, nothing to play
                     return
 
-            # Start analysis on the copy
-            with self.engine.analysis(board_copy, self.time_limit) as analysis:
-                with self.board_lock:
-                    self.current_analysis = analysis
-                
-                for info in analysis:
-                    with self.board_lock:
-                        if self.is_force_quit_engine or self.game_status != PLAYING \
-                            or self.current_search_id != search_id:
-                            analysis.stop()
-                            break
-                        self.search_info.update(info)    
-                
-                result = analysis.wait()
                 if result.move not in board_copy.legal_moves:
-                    with self.board_lock:
-                        self.game_status = ENGINE_ILLEGAL_MOVE
-                        print(f"Engine suggested illegal move: {result.move}")
+                    self.game_status = ENGINE_ILLEGAL_MOVE
+                    print(f"Engine suggested illegal move: {result.move}")
                     return
-                
-                if result.move:
-                    with self.board_lock:
-                        if self.is_force_quit_engine or self.game_status != PLAYING:
-                            print("The game is terminated.")
-                            return
-
-                        if self.current_search_id != search_id:
-                            print("Old analysis terminated.")
-                            return
-
-                        # Verify move is still legal on the MAIN board
-                        if result.move in self.board.legal_moves:
-                            start_px = self.get_square_coords(result.move.from_square)
-                            end_px = self.get_square_coords(result.move.to_square)
-                            piece = self.board.piece_at(result.move.from_square)
-    
-                            if piece:
-                                self.active_animation = MoveAnimation(piece.symbol(), start_px, end_px)
-                                self.pending_move = result.move
-    
-                                if self.board.is_castling(result.move):
-                                    r_from, r_to = self.castle_map[result.move.to_square]
-                                    r_start_px = self.get_square_coords(r_from)
-                                    r_end_px = self.get_square_coords(r_to)
-                                    r_piece = self.board.piece_at(r_from)
-                                    if r_piece:
-                                        self.secondary_animation = MoveAnimation(r_piece.symbol(), r_start_px, r_end_px)
-                        else:
-                            print(f"Engine suggested move {result.move}, but it's no longer legal.")
-    
-        except (chess.engine.EngineTerminatedError, chess.engine.AnalysisComplete):
+
+                # Verify move is still legal on the MAIN board
+                if self.move_index.is_legal(result.move):
+                    self.start_move_animation(result.move)
+                    # Only lines of this search describe result.move, the display snapshot may not
+                    search_result = self.search_results.get(search_id)
+                else:
+                    print(f"Engine suggested move {result.move}, but it's no longer legal.")
+
+            # Cached after board_lock is released, the store may be slow
+            if search_result is not None and search_result.principle_variation and \
+                    search_result.principle_variation[0] == result.move:
+                self.analysis_cache.put(board_copy, search_result.score, search_result.depth,
+                                        search_result.principle_variation, result.move)
+
+        except (chess.engine.EngineTerminatedError, chess.engine.AnalysisComplete, concurrent.futures.CancelledError):
             pass # Normal engine shutdown or analysis finish
         except Exception as e:
             print(f"General Engine Thread Error: {e}")
         finally:
+            self.search_results.pop(search_id, None)
             with self.board_lock:
                 if self.current_search_id == search_id:
-                    self.current_analysis = None
+                    self.current_search = None
                     self.is_engine_thinking = False
+            self.publish_state()
+            self.notify_update()
+
+    def notify_update(self):
+        """ Wake up the GUI loop, it may be sleeping while nothing happens on its side """
+        if self.on_update is not None:
+            self.on_update()
 
     def update_time(self):
         current_time = time.time()
@@ -398,28 +569,19 @@ class BoardController:
         if self.white_clock == 0 or self.black_clock == 0:
             with self.board_lock: # Protect status change
                 self.update_game_status()
-                self.generic_notification_sound.play()
+                self.cancel_search()
+                if self.sounds is not None:
+                    self.sounds.play_notification()
                 self.source_square_display = None
                 self.target_square_display = None
                 self.legal_moves_for_source_square = []
+            self.notify_update() # The result is shown right away, not after the next idle timeout
 
     def update_game_status(self):
         # called when pushing and it doesnt need lock here
-        if self.board.is_checkmate():
-            if self.board.turn == chess.WHITE:
-                self.game_status = CHECKMATE_BY_BLACK
-            else:
-                self.game_status = CHECKMATE_BY_WHITE
-        elif self.board.is_stalemate():
-            self.game_status = STALEMATE
-        elif self.board.is_insufficient_material():
-            self.game_status = INSUFFICIENT_MATERIAL
-        elif self.board.is_repetition(3):
-            self.game_status = THREEFOLD_REPETITION
-        elif self.white_clock == 0:
-            self.game_status = TIME_PASSED_WHITE
-        elif self.black_clock == 0:
-            self.game_status = TIME_PASSED_BLACK
+        tablebase = self.tablebase if SYZYGY_ADJUDICATE else None
+        self.game_status = get_game_status(self.board, self.white_clock, self.black_clock, self.game_status, tablebase,
+                                           self.position_tracker.is_threefold_repetition())
 
         # If the engine gives illegal move, the game status is set to ENGINE_ILLEGAL_MOVE, and it can only be changed by stopping and playing again.
         # It is handled in procces_animation_and_push_move, because it cant be checked here because chess library raise exception
@@ -433,7 +595,7 @@ class BoardController:
                 self.legal_moves_for_source_square = []
 
                 self.is_engine_thinking = False
-                self.current_analysis = None
+                self.cancel_search()
                 self.is_force_quit_engine = False
 
                 self.is_promoting = False
@@ -451,18 +613,22 @@ class BoardController:
     def play_game(self):
         with self.board_lock:
             if self.game_status != PLAYING:
+                # Stop the old search before anything is cleared, its result is ignored from now on
+                self.cancel_search()
+                self.is_engine_thinking = False
+
                 self.board.set_fen(chess.STARTING_FEN)
+                self.position_tracker.reset()
+                self.move_index.invalidate()
                 self.white_clock, self.black_clock = self.last_selected_time
                 self.last_time = time.time()
                 self.game_status = PLAYING
             
-                #if not self.is_engine_thinking and self.current_analysis == None:
+                #if not self.is_engine_thinking and self.current_search == None:
 
                 self.source_square = None
                 self.legal_moves_for_source_square = []
 
-                self.is_engine_thinking = False
-                self.current_analysis = None
                 self.is_force_quit_engine = False
 
                 self.is_promoting = False
@@ -471,7 +637,7 @@ class BoardController:
                 self.source_square_display = None
                 self.target_square_display = None
 
-                self.search_info = SearchInfo()
+                self.reset_search_info()
 
                 self.active_animation = None    # Clear the "ghost" pawn animation
                 self.pending_move = None        # Clear the "ghost" move
@@ -511,32 +677,20 @@ class BoardController:
                 self.white_on_bottom = not self.white_on_bottom
 
     def get_absent_pieces(self):
-        self.absent_pices_num = {
-            'P': 0, 'N': 0, 'B': 0, 'R': 0, 'Q': 0, 'K': 0,
-            'p': 0, 'n': 0, 'b': 0, 'r': 0, 'q': 0, 'k': 0
-        }
-        active_piece_symbols = [p.symbol() for p in self.board.piece_map().values()]
-
-        for p in active_piece_symbols:
-            if p not in ('k', 'K'):
-                self.absent_pices_num[p] += 1
-        
-        for p in self.absent_pices_num.keys():
-            if p in ('p', 'P'):
-                self.absent_pices_num[p] = 8 - self.absent_pices_num[p]
-            elif p in ('N', 'n', 'B', 'b', 'R', 'r'):
-                self.absent_pices_num[p] = 2 - self.absent_pices_num[p]
-            elif p in ('Q', 'q'):
-                self.absent_pices_num[p] = 1 - self.absent_pices_num[p]
+        # The tracker keeps the counts up to date move by move, views get their own copy
+        self.absent_pices_num = dict(self.position_tracker.absent_pieces)
 
     def play_sound(self, was_capture):
+        if self.sounds is None:
+            return
+
         if was_capture:
-            self.capture_sound.play()
+            self.sounds.play_capture()
         else:
-            self.move_sound.play()
+            self.sounds.play_move()
         
         if self.game_status not in (PLAYING, GAME_PAUSED):
-            self.generic_notification_sound.play()
+            self.sounds.play_notification()
 
 
     def procces_animation_and_push_move(self, dt):
@@ -579,10 +733,14 @@ class BoardController:
                 self.target_square_display = move.to_square
 
                 is_capture = self.board.is_capture(move)
-                self.board.push(move)
+                self.push_move(move)
 
                 # Update status, pieces, and sounds
                 self.update_game_status()
+                if is_human_turn:
+                    self.resolve_ponder(move)
+                else:
+                    self.start_pondering(move)
                 self.play_sound(is_capture)
                 self.get_absent_pieces()
 
@@ -595,30 +753,25 @@ class BoardController:
         with self.board_lock:
             self.is_force_quit_engine = True
             self.game_status = GAME_PAUSED
+            self.cancel_search()
 
-        # 1. Stop the current analysis first
-        if self.current_analysis:
-            try:
-                self.current_analysis.stop()
-            except:
-                print("Error stoping analysis")
+        # Now safely quit the engine processes
+        if self.engine:
+            self.engine.quit()
+            self.engine = None
 
-        # 2. Wait for the background thread to finish its loop (max 15 seconds)
-        start_wait = time.time()
-        while time.time() - start_wait < 15.0:
-            with self.board_lock:
-                if not self.is_engine_thinking:
-                    break
-            time.sleep(0.1)
+        if self.engine_pool:
+            self.engine_pool.close()
+            self.engine_pool = None
 
-        # 3. Now safely quit the engine process
-        if self.engine:
-            try:
-                self.engine.quit()
-            except Exception as e:
-                print(f"Hard closing engine: {e}")
-                self.engine.close()
-            finally:
-                self.engine = None
-
-    
\ No newline at end of file
+        if self.tablebase:
+            self.tablebase.close()
+            self.tablebase = None
+
+        if self.opening_book:
+            self.opening_book.close()
+            self.opening_book = None
+
+        if self.analysis_cache.store:
+            self.analysis_cache.store.close()
+            self.analysis_cache.store = None
@@ -0,0 +1,137 @@
+import asyncio
+import chess
+import chess.engine
+import concurrent.futures
+import itertools
+import threading
+
+
+class EngineSearch:
+    """ Handle for one search running on the driver's event loop """
+    def __init__(self, driver, search_id):
+        self.driver = driver
+        self.search_id = search_id
+        self.future = concurrent.futures.Future()  # Resolves to chess.engine.BestMove
+        self.analysis = None
+        self.is_cancelled = False
+
+    def cancel(self):
+        """ Thread-safe. Sends UCI 'stop' right away instead of waiting for the next info line """
+        self.is_cancelled = True
+        self.driver.loop.call_soon_threadsafe(self._stop)
+
+    def ponderhit(self, time_budget):
+        """
+        Turn an infinite ponder search into a timed one: the search keeps its tree and
+        is stopped time_budget seconds from now, like a UCI ponderhit.
+        """
+        self.driver.loop.call_soon_threadsafe(self.driver.loop.call_later, time_budget, self._stop)
+
+    def _stop(self):
+        if self.analysis is not None:
+            self.analysis.stop()
+
+    def add_done_callback(self, callback):
+        """ callback(future) always runs on the loop thread, never inside the caller's locks """
+        self.future.add_done_callback(
+            lambda future: self.driver.loop.call_soon_threadsafe(callback, future))
+
+    def result(self, timeout=None):
+        return self.future.result(timeout)
+
+
+class EngineDriver:
+    """
+    Owns one engine process through chess.engine coroutines on a single long-lived
+    asyncio loop. Other threads talk to it only through thread-safe futures.
+    """
+    def __init__(self, engine_path):
+        self.engine_path = engine_path
+        self.transport = None
+        self.protocol = None
+        self.start_task = None
+        self.search_ids = itertools.count(1)
+
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self._run_loop, daemon=True)
+        self.thread.start()
+
+    def _run_loop(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    def _submit(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def start(self):
+        """ Spawn the process and run the UCI handshake, returns a Future """
+        return self._submit(self._open())
+
+    async def _open(self):
+        self.start_task = asyncio.current_task()
+        self.transport, self.protocol = await chess.engine.popen_uci(self.engine_path)
+        return self.protocol.id.get("name")
+
+    def is_ready(self):
+        return self.protocol is not None
+
+    def call_soon(self, callback, *args):
+        """ Thread-safe. callback(*args) runs on the loop thread, after the info lines received so far """
+        self.loop.call_soon_threadsafe(callback, *args)
+
+    def search(self, board, limit, on_info=None):
+        """
+        Start searching a board copy. on_info(info) is called on the loop thread for
+        every info line. Starting a new search supersedes the previous one.
+        limit=None searches until cancel() or ponderhit() (used for pondering).
+        """
+        search = EngineSearch(self, next(self.search_ids))
+        task = self._submit(self._search(search, board.copy(), limit, on_info))
+
+        def forward_result(task):
+            if task.cancelled():
+                search.future.cancel()
+            elif task.exception() is not None:
+                search.future.set_exception(task.exception())
+            else:
+                search.future.set_result(task.result())
+
+        task.add_done_callback(forward_result)
+        return search
+
+    async def _search(self, search, board, limit, on_info):
+        if self.protocol is None:
+            raise chess.engine.EngineTerminatedError("engine is not running")
+
+        with await self.protocol.analysis(board, limit) as analysis:
+            search.analysis = analysis
+            if search.is_cancelled:
+                analysis.stop()
+
+            async for info in analysis:
+                if on_info is not None:
+                    on_info(info)
+
+            return await analysis.wait()
+
+    def quit(self, timeout=15.0):
+        try:
+            self._submit(self._quit()).result(timeout)
+        except Exception as e:
+            print(f"Hard closing engine: {e}")
+            if self.transport is not None:
+                self.loop.call_soon_threadsafe(self.transport.close)
+        finally:
+            self.protocol = None
+            self.transport = None
+
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join(timeout)
+
+    async def _quit(self):
+        if self.start_task is not None and not self.start_task.done():
+            # Still in the UCI handshake, popen_uci closes the process once it is cancelled
+            self.start_task.cancel()
+            await asyncio.wait([self.start_task])
+        if self.protocol is not None:
+            await self.protocol.quit()
@@ -0,0 +1,231 @@
+import chess
+import chess.engine
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from config import *
+
+
+class EngineWorker:
+    """ One Cincinnatus process owned by the pool, started lazily on first use """
+    def __init__(self, worker_id, engine_path):
+        self.worker_id = worker_id
+        self.engine_path = engine_path
+        self.engine = None
+        self.state = ENGINE_WORKER_STOPPED
+
+        # health information
+        self.jobs_done = 0
+        self.failures = 0
+        self.last_error = None
+        self.last_used = None
+
+    def start(self):
+        self.state = ENGINE_WORKER_STARTING
+        self._close_process()  # Leftover of a dead process, if any
+        try:
+            self.engine = chess.engine.SimpleEngine.popen_uci(self.engine_path)
+        except Exception as e:
+            self.mark_dead(e)
+            raise
+        self.state = ENGINE_WORKER_IDLE
+
+    def is_alive(self):
+        return self.engine is not None and self.state != ENGINE_WORKER_DEAD
+
+    def mark_dead(self, error):
+        self.state = ENGINE_WORKER_DEAD
+        self.failures += 1
+        self.last_error = error
+
+    def analyse(self, board, limit):
+        try:
+            result = self.engine.analyse(board, limit)
+        except (chess.engine.EngineTerminatedError, chess.engine.EngineError) as e:
+            self.mark_dead(e)
+            raise
+        self.jobs_done += 1
+        self.last_used = time.time()
+        return result
+
+    def quit(self):
+        self._close_process()
+        self.state = ENGINE_WORKER_STOPPED
+
+    def _close_process(self):
+        if self.engine:
+            try:
+                self.engine.quit()
+            except Exception as e:
+                print(f"Hard closing engine worker {self.worker_id}: {e}")
+                self.engine.close()
+            finally:
+                self.engine = None
+
+    def health(self):
+        return {
+            "worker_id": self.worker_id,
+            "state": self.state,
+            "jobs_done": self.jobs_done,
+            "failures": self.failures,
+            "last_error": repr(self.last_error) if self.last_error else None,
+            "last_used": self.last_used,
+        }
+
+
+class AnalysisJob:
+    def __init__(self, board, limit):
+        self.board = board
+        self.limit = limit
+        self.future = Future()
+
+
+class EnginePool:
+    """
+    Fixed number of engine workers shared by the GUI and batch tools.
+    Workers are checked out for exclusive use (the GUI's playing engine) or
+    fed from a job queue (submit) by one dispatcher thread per worker.
+    """
+    def __init__(self, engine_path, size=None, cache=None):
+        self.engine_path = engine_path
+        self.cache = cache # Optional AnalysisCache, used for depth limited jobs
+        self.size = size or ENGINE_POOL_SIZE or os.cpu_count() or 1
+
+        self.workers = [EngineWorker(i, engine_path) for i in range(self.size)]
+        self.pool_lock = threading.Lock()
+        self.worker_released = threading.Condition(self.pool_lock)
+
+        self.jobs = queue.Queue()
+        self.dispatchers = []
+        self.is_closed = False
+
+    def checkout(self, timeout=None):
+        """ Reserve a running worker. Blocks until one is free, returns None on timeout """
+        deadline = None if timeout is None else time.time() + timeout
+
+        with self.pool_lock:
+            while True:
+                if self.is_closed:
+                    raise RuntimeError("Engine pool is closed")
+
+                worker = self._find_free_worker()
+                if worker is not None:
+                    # Reserve it before starting so no other thread takes it
+                    needs_start = worker.state != ENGINE_WORKER_IDLE
+                    worker.state = ENGINE_WORKER_STARTING
+                    break
+
+                remaining = None if deadline is None else deadline - time.time()
+                if remaining is not None and remaining <= 0:
+                    return None
+                self.worker_released.wait(remaining)
+
+        # Start or restart the process OUTSIDE the lock, the UCI handshake is slow
+        try:
+            if needs_start:
+                worker.start()
+        except Exception:
+            with self.pool_lock:
+                self.worker_released.notify()
+            raise
+
+        worker.state = ENGINE_WORKER_CHECKED_OUT
+        return worker
+
+    def _find_free_worker(self):
+        # Prefer already running processes, then stopped ones, then dead ones to restart
+        for wanted in (ENGINE_WORKER_IDLE, ENGINE_WORKER_STOPPED, ENGINE_WORKER_DEAD):
+            for worker in self.workers:
+                if worker.state == wanted:
+                    return worker
+        return None
+
+    def checkin(self, worker):
+        with self.pool_lock:
+            if worker.state != ENGINE_WORKER_DEAD:
+                worker.state = ENGINE_WORKER_IDLE
+            self.worker_released.notify()
+
+    def submit(self, board, limit):
+        """ Queue a position for analysis, returns a Future with the InfoDict """
+        if self.cache is not None and limit.depth is not None:
+            cached = self.cache.get(board, limit.depth)
+            if cached is not None:
+                future = Future()
+                future.set_result(cached.as_info())
+                return future
+
+        job = AnalysisJob(board.copy(), limit)
+        with self.pool_lock:
+            if self.is_closed:
+                raise RuntimeError("Engine pool is closed")
+            self._start_dispatchers()
+        self.jobs.put(job)
+        return job.future
+
+    def submit_many(self, boards, limit):
+        return [self.submit(board, limit) for board in boards]
+
+    def _start_dispatchers(self):
+        # Dispatcher threads are only created once somebody submits work
+        while len(self.dispatchers) < self.size:
+            thread = threading.Thread(target=self._dispatch_jobs, daemon=True)
+            thread.start()
+            self.dispatchers.append(thread)
+
+    def _dispatch_jobs(self):
+        while True:
+            job = self.jobs.get()
+            if job is None:  # Shutdown signal
+                return
+
+            if not job.future.set_running_or_notify_cancel():
+                continue
+
+            try:
+                worker = self.checkout()
+            except Exception as e:
+                job.future.set_exception(e)
+                continue
+
+            try:
+                worker.state = ENGINE_WORKER_BUSY
+                info = worker.analyse(job.board, job.limit)
+                if self.cache is not None:
+                    self.cache.put_info(job.board, info)
+                job.future.set_result(info)
+            except Exception as e:
+                job.future.set_exception(e)
+            finally:
+                self.checkin(worker)
+
+    def health(self):
+        with self.pool_lock:
+            return [worker.health() for worker in self.workers]
+
+    def close(self):
+        with self.pool_lock:
+            if self.is_closed:
+                return
+            self.is_closed = True
+            self.worker_released.notify_all()
+            dispatcher_num = len(self.dispatchers)
+
+        # Fail everything that never reached a worker
+        while True:
+            try:
+                job = self.jobs.get_nowait()
+            except queue.Empty:
+                break
+            if job is not None:
+                job.future.cancel()
+
+        for _ in range(dispatcher_num):
+            self.jobs.put(None)
+        for thread in self.dispatchers:
+            thread.join(timeout=15.0)
+
+        for worker in self.workers:
+            worker.quit()
@@ -0,0 +1,129 @@
+import chess
+import chess.engine
+import chess.polyglot
+import queue
+import sqlite3
+import threading
+from config import *
+from .analysis_cache import CachedAnalysis
+
+
+def to_signed_key(zobrist_hash):
+    # SQLite integers are signed 64 bit, polyglot hashes are unsigned
+    return zobrist_hash - (1 << 64) if zobrist_hash >= (1 << 63) else zobrist_hash
+
+
+class EvaluationStore:
+    """
+    Position -> evaluation table in SQLite keyed by the Zobrist hash.
+    WAL journal lets several GUI and batch processes read while one of them writes.
+    Scores are stored from the side to move's point of view.
+    Lookups give up quickly and writes run on a background thread, so a database locked
+    by another process never blocks the GUI or the engine thread. Errors count as misses.
+    """
+    def __init__(self, path):
+        self.path = path
+
+        # Lookups come from the GUI, engine driver and pool threads, so access is serialized by store_lock
+        self.store_lock = threading.Lock()
+        self.connection = sqlite3.connect(path, timeout=EVALUATION_STORE_READ_TIMEOUT,
+                                          check_same_thread=False, isolation_level=None)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS evaluations ("
+            "zobrist INTEGER PRIMARY KEY, "
+            "depth INTEGER NOT NULL, "
+            "score_cp INTEGER, "
+            "score_mate INTEGER, "
+            "pv TEXT NOT NULL, "
+            "best_move TEXT NOT NULL)"
+        )
+
+        # Only the writer thread uses this connection, it may wait for other processes
+        self.write_connection = sqlite3.connect(path, timeout=EVALUATION_STORE_TIMEOUT,
+                                                check_same_thread=False, isolation_level=None)
+        self.write_connection.execute("PRAGMA synchronous=NORMAL")
+        self.writes = queue.Queue()
+        self.writer = threading.Thread(target=self._write_rows, daemon=True)
+        self.writer.start()
+
+    def get(self, board, min_depth=0):
+        key = to_signed_key(chess.polyglot.zobrist_hash(board))
+        try:
+            with self.store_lock:
+                row = self.connection.execute(
+                    "SELECT depth, score_cp, score_mate, pv, best_move FROM evaluations WHERE zobrist = ?",
+                    (key,)
+                ).fetchone()
+        except sqlite3.Error as e:
+            print(f"Evaluation store lookup failed: {e}")
+            return None
+
+        if row is None or row[0] < min_depth:
+            return None
+
+        depth, score_cp, score_mate, pv, best_move = row
+        if score_mate is not None:
+            score = chess.engine.PovScore(chess.engine.Mate(score_mate), board.turn)
+        elif score_cp is not None:
+            score = chess.engine.PovScore(chess.engine.Cp(score_cp), board.turn)
+        else:
+            score = None
+
+        principle_variation = tuple(chess.Move.from_uci(move) for move in pv.split())
+        return CachedAnalysis(score, depth, principle_variation, chess.Move.from_uci(best_move))
+
+    def put(self, board, score, depth, principle_variation, best_move):
+        """ Queues the row for the writer thread and returns right away """
+        if depth is None or best_move is None:
+            return
+
+        score_cp = score_mate = None
+        if score is not None:
+            relative = score.pov(board.turn)
+            score_cp = relative.score()
+            score_mate = relative.mate()
+
+        key = to_signed_key(chess.polyglot.zobrist_hash(board))
+        pv = " ".join(move.uci() for move in principle_variation or ())
+        self.writes.put((key, depth, score_cp, score_mate, pv, best_move.uci()))
+
+    def _write_rows(self):
+        while True:
+            row = self.writes.get()
+            if row is None:
+                return
+
+            # Only a search at least as deep replaces the stored one
+            try:
+                self.write_connection.execute(
+                    "INSERT INTO evaluations (zobrist, depth, score_cp, score_mate, pv, best_move) "
+                    "VALUES (?, ?, ?, ?, ?, ?) "
+                    "ON CONFLICT(zobrist) DO UPDATE SET "
+                    "depth = excluded.depth, score_cp = excluded.score_cp, score_mate = excluded.score_mate, "
+                    "pv = excluded.pv, best_move = excluded.best_move "
+                    "WHERE excluded.depth >= evaluations.depth",
+                    row
+                )
+            except sqlite3.Error as e:
+                # The row is dropped, the position is searched again next time
+                print(f"Evaluation store write failed: {e}")
+            finally:
+                self.writes.task_done()
+
+    def flush(self):
+        """ Wait until every queued row is written """
+        self.writes.join()
+
+    def size(self):
+        with self.store_lock:
+            return self.connection.execute("SELECT COUNT(*) FROM evaluations").fetchone()[0]
+
+    def close(self):
+        # Rows queued before closing are still written
+        self.writes.put(None)
+        self.writer.join()
+        self.write_connection.close()
+        with self.store_lock:
+            self.connection.close()
@@ -10,4 +10,21 @@ def get_resource_path(relative_path):
         # The folder where your main.py lives
         base_path = os.path.dirname(os.path.abspath(sys.modules['__main__'].__file__))
     
-    return os.path.normpath(os.path.join(base_path, relative_path))
\ No newline at end of file
+    return os.path.normpath(os.path.join(base_path, relative_path))
+
+
+def get_engine_path():
+    """ Get absolute path to the Cincinnatus binary for the current OS """
+    # Choose the filename based on the OS
+    if os.name == 'nt':  # Windows (or Wine)
+        engine_file = 'cincinnatus_windows_release.exe'
+    else:  # Linux / MacOS
+        engine_file = 'cincinnatus_linux_release'
+
+    engine_path = get_resource_path(os.path.join('engines', engine_file))
+
+    # Double-check the file exists to prevent a silent crash
+    if not os.path.exists(engine_path):
+        raise FileNotFoundError(f"Engine not found at: {engine_path}")
+
+    return engine_path
@@ -0,0 +1,47 @@
+import chess
+from config import *
+
+
+def get_game_status(board, white_clock, black_clock, game_status=PLAYING, tablebase=None, is_repetition=None):
+    """
+    Status of the game after a move or a clock tick. Shared by the GUI and headless matches.
+    With a Tablebase, positions it covers are adjudicated right away.
+    is_repetition comes from a PositionTracker, None falls back to replaying the move stack.
+    """
+    if is_repetition is None:
+        is_repetition = board.is_repetition(3)
+
+    if board.is_checkmate():
+        if board.turn == chess.WHITE:
+            return CHECKMATE_BY_BLACK
+        else:
+            return CHECKMATE_BY_WHITE
+    elif board.is_stalemate():
+        return STALEMATE
+    elif board.is_insufficient_material():
+        return INSUFFICIENT_MATERIAL
+    elif is_repetition:
+        return THREEFOLD_REPETITION
+
+    if tablebase is not None:
+        tablebase_status = tablebase.get_game_status(board)
+        if tablebase_status is not None:
+            return tablebase_status
+
+    if white_clock == 0:
+        return TIME_PASSED_WHITE
+    elif black_clock == 0:
+        return TIME_PASSED_BLACK
+
+    return game_status
+
+
+def get_white_score(game_status):
+    """ 1 for a white win, 0 for a black win, 0.5 for a draw, None if the game isn't decided """
+    if game_status in (CHECKMATE_BY_WHITE, TIME_PASSED_BLACK, TABLEBASE_WIN_WHITE):
+        return 1.0
+    elif game_status in (CHECKMATE_BY_BLACK, TIME_PASSED_WHITE, TABLEBASE_WIN_BLACK):
+        return 0.0
+    elif game_status in (STALEMATE, INSUFFICIENT_MATERIAL, THREEFOLD_REPETITION, TABLEBASE_DRAW):
+        return 0.5
+    return None
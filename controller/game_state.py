@@ -0,0 +1,52 @@
+import chess
+
+
+class GameState:
+    """
+    Snapshot of everything the views draw, published by the controller under board_lock.
+    Never modified once created, the renderer reads controller.game_state without the lock.
+    """
+    __slots__ = ("position", "turn", "pieces", "checked_kings", "white_on_bottom",
+                 "source_square_display", "target_square_display", "legal_targets",
+                 "pending_move", "is_pending_castling", "animations", "is_promoting",
+                 "game_status", "white_clock", "black_clock", "absent_pieces")
+
+    def __init__(self, ctrl, previous=None):
+        """ Copy of the controller's fields. Caller must hold board_lock """
+        board = ctrl.board
+        # Piece placement as bitboards, board_fen() would cost more than the rest of the copy
+        self.position = (board.pawns, board.knights, board.bishops, board.rooks, board.queens, board.kings,
+                         board.occupied_co[chess.WHITE], board.occupied_co[chess.BLACK])
+        self.turn = board.turn
+        if previous is not None and previous.position == self.position and previous.turn == self.turn:
+            # Same position, clocks and animations change much more often than the pieces
+            self.pieces = previous.pieces
+            self.checked_kings = previous.checked_kings
+        else:
+            self.pieces = tuple((square, piece.symbol()) for square, piece in board.piece_map().items())
+            self.checked_kings = tuple(
+                king for king in (board.king(chess.WHITE), board.king(chess.BLACK))
+                if king is not None and board.is_attacked_by(not board.color_at(king), king)
+            )
+
+        self.white_on_bottom = ctrl.white_on_bottom
+        self.source_square_display = ctrl.source_square_display
+        self.target_square_display = ctrl.target_square_display
+        self.legal_targets = tuple(move.to_square for move in ctrl.legal_moves_for_source_square)
+
+        self.pending_move = ctrl.pending_move
+        self.is_pending_castling = ctrl.pending_move is not None and board.is_castling(ctrl.pending_move)
+        # (piece symbol, (x, y)) of the moving king or piece, then of the castling rook
+        self.animations = tuple((anim.piece_symbol, anim.current_pos)
+                                for anim in (ctrl.active_animation, ctrl.secondary_animation) if anim)
+        self.is_promoting = ctrl.is_promoting
+
+        self.game_status = ctrl.game_status
+        self.white_clock = ctrl.white_clock
+        self.black_clock = ctrl.black_clock
+        self.absent_pieces = tuple(ctrl.absent_pices_num.items())
+
+    def get_board_key(self):
+        """ Everything the board layer depends on """
+        return (self.position, self.white_on_bottom, self.source_square_display, self.target_square_display,
+                self.legal_targets, self.pending_move, self.animations)
@@ -0,0 +1,293 @@
+import chess
+import chess.engine
+import chess.pgn
+import concurrent.futures
+import math
+import multiprocessing.util
+import os
+import time
+from config import *
+from .game_rules import get_game_status, get_white_score
+from .position_tracker import PositionTracker
+from .tablebase import Tablebase
+
+
+TERMINATION_NAMES = {
+    CHECKMATE_BY_WHITE: "checkmate",
+    CHECKMATE_BY_BLACK: "checkmate",
+    STALEMATE: "stalemate",
+    INSUFFICIENT_MATERIAL: "insufficient material",
+    TIME_PASSED_WHITE: "white lost on time",
+    TIME_PASSED_BLACK: "black lost on time",
+    THREEFOLD_REPETITION: "threefold repetition",
+    ENGINE_ILLEGAL_MOVE: "illegal move",
+    TABLEBASE_WIN_WHITE: "tablebase adjudication",
+    TABLEBASE_WIN_BLACK: "tablebase adjudication",
+    TABLEBASE_DRAW: "tablebase adjudication",
+}
+
+
+# Engines are kept alive for the whole life of a worker process, keyed by (slot, path)
+_worker_engines = {}
+_worker_finalizer = None
+_worker_tablebases = {}
+
+
+def _get_engine(slot, engine_path):
+    global _worker_finalizer
+
+    engine = _worker_engines.get((slot, engine_path))
+    if engine is None:
+        engine = chess.engine.SimpleEngine.popen_uci(engine_path)
+        _worker_engines[(slot, engine_path)] = engine
+
+        # Pool workers skip atexit, multiprocessing finalizers still run on exit
+        if _worker_finalizer is None:
+            _worker_finalizer = multiprocessing.util.Finalize(None, close_worker_engines, exitpriority=10)
+    return engine
+
+
+def _get_tablebase(tablebase_path):
+    if tablebase_path is None:
+        return None
+    if tablebase_path not in _worker_tablebases:
+        _worker_tablebases[tablebase_path] = Tablebase(tablebase_path)
+    return _worker_tablebases[tablebase_path]
+
+
+def _drop_engine(slot, engine_path):
+    engine = _worker_engines.pop((slot, engine_path), None)
+    if engine is not None:
+        try:
+            engine.close()
+        except Exception:
+            pass
+
+
+def close_worker_engines():
+    for engine in _worker_engines.values():
+        try:
+            engine.quit()
+        except Exception:
+            engine.close()
+    _worker_engines.clear()
+
+
+def load_openings(path=None):
+    """ Openings as (fen, [uci moves]). From an EPD/FEN file, one position per line, or the built-in suite """
+    openings = []
+    if path is None:
+        for line in OPENING_SUITE:
+            board = chess.Board()
+            for san in line.split():
+                board.push_san(san)
+            openings.append((chess.STARTING_FEN, [move.uci() for move in board.move_stack]))
+        return openings
+
+    with open(path) as file:
+        for line in file:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            # EPD lines carry operations after the 4 position fields, FEN lines carry clocks
+            fields = line.split()
+            if len(fields) >= 6 and fields[4].isdigit() and fields[5].isdigit():
+                board = chess.Board(" ".join(fields[:6]))
+            else:
+                board, _ = chess.Board.from_epd(line)
+            openings.append((board.fen(), []))
+    return openings
+
+
+def play_game(engine_paths, opening, a_is_white, clock, moves_to_go, game_id, tablebase_path=None):
+    """
+    Play one game between engine slots 'a' and 'b' in this process.
+    Returns a plain dict, so it can be sent back from a process pool worker.
+    """
+    tablebase = _get_tablebase(tablebase_path)
+    fen, opening_moves = opening
+    board = chess.Board(fen)
+    for uci in opening_moves:
+        board.push_uci(uci)
+    tracker = PositionTracker(board)
+
+    slots = {chess.WHITE: "a" if a_is_white else "b", chess.BLACK: "b" if a_is_white else "a"}
+    clocks = {chess.WHITE: float(clock), chess.BLACK: float(clock)}
+    game_status = PLAYING
+    loser = None
+    termination = None
+
+    while game_status == PLAYING:
+        turn = board.turn
+        slot = slots[turn]
+        limit = chess.engine.Limit(white_clock=clocks[chess.WHITE], black_clock=clocks[chess.BLACK],
+                                   remaining_moves=moves_to_go)
+
+        start = time.perf_counter()
+        try:
+            engine = _get_engine(slot, engine_paths[slot])
+            result = engine.play(board, limit, game=game_id)
+        except (chess.engine.EngineTerminatedError, chess.engine.EngineError) as e:
+            _drop_engine(slot, engine_paths[slot])
+            game_status, loser, termination = ENGINE_ILLEGAL_MOVE, turn, f"engine error: {e}"
+            break
+        clocks[turn] = max(0.0, clocks[turn] - (time.perf_counter() - start))
+
+        if clocks[turn] == 0:
+            game_status = get_game_status(board, clocks[chess.WHITE], clocks[chess.BLACK], game_status)
+            break
+
+        if result.move is None or result.move not in board.legal_moves:
+            game_status, loser = ENGINE_ILLEGAL_MOVE, turn
+            break
+
+        tracker.push(result.move)
+        game_status = get_game_status(board, clocks[chess.WHITE], clocks[chess.BLACK], game_status, tablebase,
+                                      tracker.is_threefold_repetition())
+
+        # The GUI lets games run on, unattended matches stop at the fifty move rule
+        if game_status == PLAYING and board.is_fifty_moves():
+            termination = "fifty moves"
+            break
+
+    if game_status == ENGINE_ILLEGAL_MOVE:
+        white_score = 0.0 if loser == chess.WHITE else 1.0
+    elif game_status == PLAYING:
+        white_score = 0.5
+    else:
+        white_score = get_white_score(game_status)
+
+    game = chess.pgn.Game.from_board(board)
+    game.headers["White"] = engine_paths[slots[chess.WHITE]]
+    game.headers["Black"] = engine_paths[slots[chess.BLACK]]
+    game.headers["Termination"] = termination or TERMINATION_NAMES.get(game_status, "")
+
+    return {
+        "game_id": game_id,
+        "a_is_white": a_is_white,
+        "a_score": white_score if a_is_white else 1.0 - white_score,
+        "termination": game.headers["Termination"],
+        "plies": board.ply(),
+        "pgn": str(game),
+    }
+
+
+def expected_score(elo):
+    return 1.0 / (1.0 + 10 ** (-elo / 400.0))
+
+
+def score_to_elo(score):
+    score = min(max(score, 1e-6), 1.0 - 1e-6)
+    return -400.0 * math.log10(1.0 / score - 1.0)
+
+
+class MatchStats:
+    """ Win/draw/loss counts from engine A's point of view, with Elo and SPRT estimates """
+    def __init__(self, elo0=0.0, elo1=5.0, alpha=0.05, beta=0.05):
+        self.wins = 0
+        self.draws = 0
+        self.losses = 0
+
+        self.elo0 = elo0
+        self.elo1 = elo1
+        self.lower_bound = math.log(beta / (1.0 - alpha))
+        self.upper_bound = math.log((1.0 - beta) / alpha)
+
+    def add(self, a_score):
+        if a_score == 1.0:
+            self.wins += 1
+        elif a_score == 0.0:
+            self.losses += 1
+        else:
+            self.draws += 1
+
+    def games(self):
+        return self.wins + self.draws + self.losses
+
+    def score(self):
+        n = self.games()
+        return (self.wins + 0.5 * self.draws) / n if n else 0.5
+
+    def variance(self):
+        """ Per game variance of the score """
+        n = self.games()
+        if n == 0:
+            return 0.0
+        p = self.score()
+        return (self.wins * (1.0 - p) ** 2 + self.draws * (0.5 - p) ** 2 + self.losses * p ** 2) / n
+
+    def elo(self):
+        return score_to_elo(self.score())
+
+    def elo_error(self):
+        """ Half width of the 95% confidence interval """
+        n = self.games()
+        if n == 0:
+            return float("inf")
+        margin = 1.96 * math.sqrt(self.variance() / n)
+        return (score_to_elo(self.score() + margin) - score_to_elo(self.score() - margin)) / 2.0
+
+    def llr(self):
+        """ Log-likelihood ratio of H1 (elo1) against H0 (elo0), normal approximation """
+        variance = self.variance()
+        if variance == 0.0:
+            return 0.0
+        s0, s1 = expected_score(self.elo0), expected_score(self.elo1)
+        return self.games() * (s1 - s0) * (2.0 * self.score() - s0 - s1) / (2.0 * variance)
+
+    def sprt_result(self):
+        llr = self.llr()
+        if llr >= self.upper_bound:
+            return "H1 accepted"
+        elif llr <= self.lower_bound:
+            return "H0 accepted"
+        return None
+
+    def summary(self):
+        return (f"+{self.wins} ={self.draws} -{self.losses} | score {self.score():.3f} | "
+                f"Elo {self.elo():+.1f} +/- {self.elo_error():.1f} | "
+                f"LLR {self.llr():.2f} [{self.lower_bound:.2f}, {self.upper_bound:.2f}]")
+
+
+class MatchRunner:
+    """
+    Plays engine A against engine B without pygame. Games run in a process pool,
+    each opening is played with both colors and the match can stop on an SPRT decision.
+    """
+    def __init__(self, engine_a, engine_b, games, time_control=1, openings=None,
+                 concurrency=None, stats=None, stop_on_sprt=False, tablebase_path=None):
+        self.engine_paths = {"a": engine_a, "b": engine_b}
+        self.games = games
+        self.clock, self.moves_to_go = TIME_CONTROLS[time_control]
+        self.openings = openings or load_openings()
+        # Every game runs two engine processes
+        self.concurrency = concurrency or max(1, (os.cpu_count() or 2) // 2)
+        self.stats = stats or MatchStats()
+        self.stop_on_sprt = stop_on_sprt
+        self.tablebase_path = tablebase_path # Syzygy folder used to adjudicate solved endgames
+
+    def run(self, on_game_finished=None):
+        results = []
+        with concurrent.futures.ProcessPoolExecutor(max_workers=self.concurrency) as executor:
+            futures = []
+            for game_index in range(self.games):
+                opening = self.openings[(game_index // 2) % len(self.openings)]
+                a_is_white = game_index % 2 == 0
+                futures.append(executor.submit(play_game, self.engine_paths, opening, a_is_white,
+                                               self.clock, self.moves_to_go, game_index, self.tablebase_path))
+
+            for future in concurrent.futures.as_completed(futures):
+                if future.cancelled():
+                    continue
+                result = future.result()
+                results.append(result)
+                self.stats.add(result["a_score"])
+
+                if on_game_finished:
+                    on_game_finished(result, self.stats)
+
+                if self.stop_on_sprt and self.stats.sprt_result():
+                    for pending in futures:
+                        pending.cancel()
+
+        return results
@@ -1,20 +1,25 @@
-import pygame as pg
-
 class MoveAnimation:
+    """ Screen position of a moving piece over time, plain (x, y) tuples so the controller needs no pygame """
     def __init__(self, piece_symbol, start_pos, end_pos, duration=0.15):
         self.piece_symbol = piece_symbol
-        self.start_pos = pg.Vector2(start_pos)
-        self.end_pos = pg.Vector2(end_pos)
-        self.current_pos = pg.Vector2(start_pos)
+        self.start_pos = tuple(start_pos)
+        self.end_pos = tuple(end_pos)
+        self.current_pos = self.start_pos
         self.duration = duration
         self.elapsed = 0
         self.is_done = False
 
     def update(self, dt):
         self.elapsed += dt
-        t = min(1.0, self.elapsed / self.duration)
+        t = min(1.0, self.elapsed / self.duration) if self.duration > 0 else 1.0
         # "Ease out" curve for smoother landing
         t = t * (2 - t) 
-        self.current_pos = self.start_pos.lerp(self.end_pos, t)
+        (start_x, start_y), (end_x, end_y) = self.start_pos, self.end_pos
+        self.current_pos = (start_x + (end_x - start_x) * t, start_y + (end_y - start_y) * t)
         if t >= 1.0:
-            self.is_done = True
\ No newline at end of file
+            self.is_done = True
+
+
+def instant_animation(piece_symbol, start_pos, end_pos):
+    """ Animation factory for headless use, the move is finished by the first update """
+    return MoveAnimation(piece_symbol, start_pos, end_pos, duration=0)
@@ -0,0 +1,28 @@
+class LegalMoveIndex:
+    """
+    Legal moves of the current position grouped by from-square, plus a set for O(1)
+    legality checks. Built on first use and dropped with invalidate() when the board changes.
+    """
+    def __init__(self, board):
+        self.board = board
+        # (moves by from-square, set of moves) in one tuple, so readers never see half an index
+        self.index = None
+
+    def invalidate(self):
+        self.index = None
+
+    def get_index(self):
+        index = self.index
+        if index is None:
+            moves_by_square = {}
+            for move in self.board.legal_moves:
+                moves_by_square.setdefault(move.from_square, []).append(move)
+            index = (moves_by_square, set(move for moves in moves_by_square.values() for move in moves))
+            self.index = index
+        return index
+
+    def moves_from(self, square):
+        return self.get_index()[0].get(square, [])
+
+    def is_legal(self, move):
+        return move in self.get_index()[1]
@@ -0,0 +1,31 @@
+import chess.polyglot
+from config import *
+
+
+class OpeningBook:
+    """
+    Polyglot opening book. python-chess memory maps the .bin file and binary
+    searches the sorted Zobrist keys, so a lookup costs microseconds.
+    """
+    def __init__(self, path, max_ply=BOOK_MAX_PLY):
+        self.path = path
+        self.max_ply = max_ply
+        self.reader = chess.polyglot.open_reader(path)
+
+    def choose_move(self, board):
+        """ Book move picked at random, weighted by the entry weights. None when out of book """
+        if board.ply() >= self.max_ply:
+            return None
+
+        try:
+            entry = self.reader.weighted_choice(board)
+        except IndexError:
+            return None
+
+        # Guard against books with colliding keys or broken entries
+        if entry.move not in board.legal_moves:
+            return None
+        return entry.move
+
+    def close(self):
+        self.reader.close()
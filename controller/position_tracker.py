@@ -0,0 +1,105 @@
+import chess
+import chess.polyglot
+
+
+STARTING_PIECES_NUM = {
+    'P': 8, 'N': 2, 'B': 2, 'R': 2, 'Q': 1, 'K': 1,
+    'p': 8, 'n': 2, 'b': 2, 'r': 2, 'q': 1, 'k': 1
+}
+
+
+class PositionTracker:
+    """
+    Material and repetition bookkeeping updated from each move instead of rescanning the board.
+    All moves must go through push()/pop(), reset() resyncs after set_fen or any other direct edit.
+    """
+    def __init__(self, board):
+        self.board = board
+        self.reset()
+
+    def reset(self):
+        """ Full rebuild, O(game length). Only needed when the board was changed behind our back """
+        self.absent_pieces = dict(STARTING_PIECES_NUM)
+        for piece in self.board.piece_map().values():
+            self.absent_pieces[piece.symbol()] -= 1
+
+        # Zobrist hash -> occurrences since the last irreversible move
+        self.occurrences = {}
+        self.history = [] # (hash, captured symbol, promotion symbols, occurrences before an irreversible move)
+        self.current_hash = None
+
+        replay = self.board.root()
+        self._count(replay)
+        for move in self.board.move_stack:
+            if replay.is_irreversible(move):
+                self.occurrences = {}
+            replay.push(move)
+            self._count(replay)
+
+    def _count(self, board):
+        self.current_hash = chess.polyglot.zobrist_hash(board)
+        self.occurrences[self.current_hash] = self.occurrences.get(self.current_hash, 0) + 1
+
+    def _captured_symbol(self, move):
+        if self.board.is_en_passant(move):
+            return 'p' if self.board.turn == chess.WHITE else 'P'
+        captured = self.board.piece_at(move.to_square)
+        # Castling is encoded as king takes own rook
+        if captured is None or captured.color == self.board.turn:
+            return None
+        return captured.symbol()
+
+    def push(self, move):
+        """ Push move on the board and update counts from its delta """
+        captured = self._captured_symbol(move)
+        promotion = None
+        if move.promotion:
+            pawn = 'P' if self.board.turn == chess.WHITE else 'p'
+            promotion = (pawn, chess.Piece(move.promotion, self.board.turn).symbol())
+
+        # Positions before an irreversible move can never come back, start a fresh counter
+        previous_occurrences = None
+        if self.board.is_irreversible(move):
+            previous_occurrences = self.occurrences
+            self.occurrences = {}
+
+        self.history.append((self.current_hash, captured, promotion, previous_occurrences))
+        self.board.push(move)
+
+        if captured:
+            self.absent_pieces[captured] += 1
+        if promotion:
+            self.absent_pieces[promotion[0]] += 1
+            self.absent_pieces[promotion[1]] -= 1
+        self._count(self.board)
+
+    def pop(self):
+        """ Take back the last move, the inverse of push() """
+        if not self.history:
+            # Moves pushed before the last reset() have no saved delta
+            move = self.board.pop()
+            self.reset()
+            return move
+
+        previous_hash, captured, promotion, previous_occurrences = self.history.pop()
+
+        self.occurrences[self.current_hash] -= 1
+        if self.occurrences[self.current_hash] == 0:
+            del self.occurrences[self.current_hash]
+        if previous_occurrences is not None:
+            self.occurrences = previous_occurrences
+
+        if captured:
+            self.absent_pieces[captured] -= 1
+        if promotion:
+            self.absent_pieces[promotion[0]] -= 1
+            self.absent_pieces[promotion[1]] += 1
+
+        self.current_hash = previous_hash
+        return self.board.pop()
+
+    def repetition_count(self):
+        return self.occurrences.get(self.current_hash, 0)
+
+    def is_threefold_repetition(self):
+        return self.repetition_count() >= 3
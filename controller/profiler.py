@@ -0,0 +1,117 @@
+import contextlib
+import itertools
+import json
+import os
+import threading
+import time
+from config import *
+
+
+class FrameProfiler:
+    """
+    Timings of the main loop stages and lock waits in a fixed-size ring buffer.
+    Disabled by default, then stage() is a shared no-op context and costs one attribute check.
+    Any thread can record, the slot counter is the only shared state.
+    """
+    def __init__(self, capacity=PROFILER_CAPACITY):
+        self.capacity = capacity
+        self.enabled = False
+        self.origin = time.perf_counter()
+        self.events = [None] * capacity # (name, thread id, start, duration), start from origin
+        self.slots = itertools.count()
+        self.no_op = contextlib.nullcontext()
+
+    def set_enabled(self, enabled):
+        if enabled and not self.enabled:
+            self.clear()
+        self.enabled = enabled
+
+    def clear(self):
+        self.events = [None] * self.capacity
+        self.slots = itertools.count()
+
+    def record(self, name, start, duration):
+        """ start is a time.perf_counter() value """
+        self.events[next(self.slots) % self.capacity] = (name, threading.get_ident(), start - self.origin, duration)
+
+    def stage(self, name):
+        if not self.enabled:
+            return self.no_op
+        return self._timed_stage(name)
+
+    @contextlib.contextmanager
+    def _timed_stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, start, time.perf_counter() - start)
+
+    def get_events(self):
+        return [event for event in self.events if event is not None]
+
+    def stats(self):
+        """ name -> (count, p50, p95, max) in milliseconds over the buffered events """
+        durations = {}
+        for name, _, _, duration in self.get_events():
+            durations.setdefault(name, []).append(duration * 1000)
+
+        stats = {}
+        for name, values in durations.items():
+            values.sort()
+            stats[name] = (len(values), values[len(values) // 2], values[int(len(values) * 0.95)], values[-1])
+        return stats
+
+    def dump_chrome_trace(self, path):
+        """ Write the buffered events as Chrome trace JSON, open it in chrome://tracing or Perfetto """
+        pid = os.getpid()
+        trace_events = [
+            {"name": name, "ph": "X", "ts": start * 1e6, "dur": duration * 1e6, "pid": pid, "tid": thread_id}
+            for name, thread_id, start, duration in sorted(self.get_events(), key=lambda event: event[2])
+        ]
+        with open(path, "w") as file:
+            json.dump({"traceEvents": trace_events, "displayTimeUnit": "ms"}, file)
+        return len(trace_events)
+
+
+class ProfiledLock:
+    """ threading.Lock that records "<name> wait" and "<name> hold" times while the profiler is enabled """
+    def __init__(self, name):
+        self.name = name
+        self.lock = threading.Lock()
+        self.acquired_at = None # Only the thread holding the lock touches it
+
+    def acquire(self, blocking=True, timeout=-1):
+        if not profiler.enabled:
+            return self.lock.acquire(blocking, timeout)
+
+        start = time.perf_counter()
+        is_acquired = self.lock.acquire(blocking, timeout)
+        acquired_at = time.perf_counter()
+        profiler.record(f"{self.name} wait", start, acquired_at - start)
+        if is_acquired:
+            self.acquired_at = acquired_at
+        return is_acquired
+
+    def release(self):
+        acquired_at, self.acquired_at = self.acquired_at, None
+        if acquired_at is None:
+            self.lock.release()
+            return
+
+        released_at = time.perf_counter()
+        self.lock.release()
+        profiler.record(f"{self.name} hold", acquired_at, released_at - acquired_at)
+
+    def locked(self):
+        return self.lock.locked()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.release()
+
+
+profiler = FrameProfiler()
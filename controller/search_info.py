@@ -1,20 +1,71 @@
+import asyncio
+import time
+from config import *
+
+
 class SearchInfo:
-    def __init__(self):
-        self.eval = None
-        self.depth = None
-        self.principle_variation = None
-
-    def update(self, info):
-        if "score" in info:    
-            score_obj = info["score"].relative
-            self.eval = score_obj.score()
-
-        # 2. Depth
-        if "depth" in info:
-            self.depth = info['depth']
-    
-        # 3. Best Line (Principal Variation)
-        if "pv" in info:
-            self.principle_variation = info["pv"]
-
-    
\ No newline at end of file
+    """ Snapshot of the engine's search. Never modified once created, so any thread can read it """
+    __slots__ = ("score", "eval", "depth", "principle_variation")
+
+    def __init__(self, score=None, depth=None, principle_variation=None):
+        self.score = score
+        self.eval = score.relative.score() if score is not None else None
+        self.depth = depth
+        self.principle_variation = tuple(principle_variation) if principle_variation is not None else None
+
+    def updated(self, info):
+        """ New snapshot with the score, depth and PV found in the engine's info dict """
+        return SearchInfo(
+            info.get("score", self.score),
+            info.get("depth", self.depth),
+            info.get("pv", self.principle_variation)
+        )
+
+
+class SearchInfoPublisher:
+    """
+    The engine side merges info lines and publishes immutable SearchInfo snapshots by
+    swapping one reference, so the renderer reads .latest without taking board_lock.
+    Lines arriving faster than once per frame are merged into a single snapshot.
+    """
+    def __init__(self, min_interval=1.0 / FPS, on_publish=None):
+        self.latest = SearchInfo()
+        self.min_interval = min_interval
+        self.on_publish = on_publish # Called after every new snapshot, from the publishing thread
+
+        # Only touched by the engine driver thread
+        self.pending = {}
+        self.last_publish = 0.0
+        self.flush_handle = None
+
+    def push(self, info):
+        for key in ("score", "depth", "pv"):
+            if key in info:
+                self.pending[key] = info[key]
+
+        wait = self.last_publish + self.min_interval - time.perf_counter()
+        if wait <= 0:
+            self.flush()
+        elif self.flush_handle is None:
+            # Make sure the last merged lines show up even if the engine goes quiet
+            try:
+                self.flush_handle = asyncio.get_running_loop().call_later(wait, self.flush)
+            except RuntimeError:  # Not called from an event loop
+                self.flush()
+
+    def flush(self):
+        if self.flush_handle is not None:
+            self.flush_handle.cancel()
+            self.flush_handle = None
+
+        if self.pending:
+            self.latest = self.latest.updated(self.pending)
+            self.pending = {}
+            if self.on_publish is not None:
+                self.on_publish()
+        self.last_publish = time.perf_counter()
+
+    def reset(self, search_info=None):
+        """ Show a new snapshot, lines of the previous search that are still pending are dropped """
+        self.pending = {}
+        self.latest = search_info or SearchInfo()
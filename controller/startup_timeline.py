@@ -0,0 +1,43 @@
+import threading
+import time
+from contextlib import contextmanager
+
+
+class StartupTimeline:
+    """ Start and end of every startup stage, measured from one origin, from any thread """
+    def __init__(self):
+        self.origin = time.perf_counter()
+        self.stages = [] # (name, thread name, start, end) in seconds since origin
+        self.timeline_lock = threading.Lock()
+
+    def now(self):
+        return time.perf_counter() - self.origin
+
+    def add(self, name, start, end=None):
+        with self.timeline_lock:
+            self.stages.append((name, threading.current_thread().name, start, start if end is None else end))
+
+    @contextmanager
+    def stage(self, name):
+        start = self.now()
+        try:
+            yield
+        finally:
+            self.add(name, start, self.now())
+
+    def mark(self, name):
+        """ Point in time without a duration, like the first frame """
+        self.add(name, self.now())
+
+    def report(self):
+        with self.timeline_lock:
+            stages = sorted(self.stages, key=lambda stage: (stage[2], stage[3]))
+
+        lines = ["Startup timeline:"]
+        for name, thread_name, start, end in stages:
+            if end == start:
+                lines.append(f"  {name:<22} at {start * 1000:8.1f} ms")
+            else:
+                lines.append(f"  {name:<22} {start * 1000:8.1f} -> {end * 1000:8.1f} ms "
+                             f"({(end - start) * 1000:7.1f} ms, {thread_name})")
+        print("\n".join(lines))
@@ -0,0 +1,70 @@
+import chess
+import chess.syzygy
+from config import *
+
+
+class Tablebase:
+    """
+    Syzygy WDL/DTZ probing. python-chess memory maps the table files, so only the
+    pages touched by a probe are read from disk.
+    """
+    def __init__(self, path):
+        self.path = path
+        self.tablebase = chess.syzygy.open_tablebase(path)
+        # Table names look like KQvKR, the longest one tells how many pieces are covered
+        self.max_pieces = max((len(name) - 1 for name in self.tablebase.wdl), default=0)
+
+    def covers(self, board):
+        return not board.castling_rights and chess.popcount(board.occupied) <= self.max_pieces
+
+    def probe_wdl(self, board):
+        """ 2 win, 1 cursed win, 0 draw, -1 blessed loss, -2 loss for the side to move. None if unknown """
+        if not self.covers(board):
+            return None
+        try:
+            return self.tablebase.probe_wdl(board)
+        except KeyError:  # Also raised for missing tables
+            return None
+
+    def best_move(self, board):
+        """ Move keeping the best result, winning as fast and losing as slow as DTZ allows. board is not modified """
+        if not self.covers(board):
+            return None
+
+        # Moves are tried on a copy, the caller's board stays intact whatever a probe raises
+        board = board.copy(stack=False)
+        best_move = None
+        best_key = None
+        for move in board.legal_moves:
+            board.push(move)
+            try:
+                if board.is_checkmate():
+                    key = (2, 1, 0)
+                else:
+                    # Probes are from the opponent's point of view after the move
+                    wdl = -self.tablebase.probe_wdl(board)
+                    dtz = abs(self.tablebase.probe_dtz(board))
+                    key = (wdl, 0, -dtz if wdl > 0 else dtz)
+            except KeyError:
+                return None
+            finally:
+                board.pop()
+
+            if best_key is None or key > best_key:
+                best_move, best_key = move, key
+
+        return best_move
+
+    def get_game_status(self, board):
+        """ Adjudicated status, cursed wins and blessed losses are draws by the fifty move rule """
+        wdl = self.probe_wdl(board)
+        if wdl is None:
+            return None
+        if wdl in (-1, 0, 1):
+            return TABLEBASE_DRAW
+        if (wdl > 0) == (board.turn == chess.WHITE):
+            return TABLEBASE_WIN_WHITE
+        return TABLEBASE_WIN_BLACK
+
+    def close(self):
+        self.tablebase.close()
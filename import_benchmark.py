@@ -0,0 +1,69 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+# Every case runs in a fresh interpreter, from before its first import until the controller exists.
+# Without an engine binary, the engine start is skipped in all of them
+CONTROLLER = """
+from controller import BoardController
+
+class Controller(BoardController):
+    def load_engine(self, wait=True):
+        self.engine = self.engine_pool = self.engine_start = None
+
+    def open_evaluation_store(self):
+        return None
+"""
+
+CASES = {
+    "headless core": CONTROLLER + """
+Controller()
+""",
+    "core + pygame sounds": CONTROLLER + """
+from view.sound_player import SoundPlayer
+Controller(sounds=SoundPlayer())
+""",
+    "GUI modules": """
+import view
+""",
+}
+
+
+def measure_case(name):
+    """ Runs in the child interpreter, nothing but this module is imported before the clock starts """
+    start = time.perf_counter()
+    exec(compile(CASES[name], "<case>", "exec"), {})
+    print(json.dumps({"seconds": time.perf_counter() - start, "pygame": "pygame" in sys.modules}))
+
+
+def run_case(name):
+    env = dict(os.environ, PYGAME_HIDE_SUPPORT_PROMPT="1")
+    env.setdefault("SDL_AUDIODRIVER", "dummy") # The mixer needs some audio device
+    output = subprocess.run([sys.executable, os.path.abspath(__file__), "--case", name],
+                            env=env, capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time to import the controller and build a game, with and without pygame")
+    parser.add_argument("--runs", type=int, default=10, help="fresh interpreters per case")
+    parser.add_argument("--case", choices=list(CASES), help=argparse.SUPPRESS) # Set for the child interpreters
+    args = parser.parse_args()
+
+    if args.case:
+        measure_case(args.case)
+        return
+
+    print(f"{'case':<22}{'median ms':>11}{'min ms':>9}  pygame imported")
+    for name in CASES:
+        results = [run_case(name) for _ in range(args.runs)]
+        times = [result["seconds"] * 1000 for result in results]
+        print(f"{name:<22}{statistics.median(times):>11.1f}{min(times):>9.1f}  {results[0]['pygame']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+import argparse
+import os
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+from controller.file_path import get_engine_path
+from controller.match_runner import MatchRunner, MatchStats, load_openings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless engine vs engine match")
+    parser.add_argument("--engine-a", help="UCI engine under test (default: bundled Cincinnatus)")
+    parser.add_argument("--engine-b", help="UCI opponent (default: bundled Cincinnatus)")
+    parser.add_argument("--games", type=int, default=100)
+    parser.add_argument("--time", type=int, choices=(1, 5, 10), default=1, help="minutes per side")
+    parser.add_argument("--concurrency", type=int, help="parallel games (default: cores / 2)")
+    parser.add_argument("--openings", help="EPD or FEN file, one position per line (default: built-in suite)")
+    parser.add_argument("--sprt", type=float, nargs=2, metavar=("ELO0", "ELO1"), default=(0.0, 5.0))
+    parser.add_argument("--stop-on-sprt", action="store_true", help="stop once SPRT accepts a hypothesis")
+    parser.add_argument("--pgn", help="write finished games to this file")
+    parser.add_argument("--syzygy", help="Syzygy folder, games are adjudicated once the tablebases cover them")
+    args = parser.parse_args()
+
+    engine_a = args.engine_a or get_engine_path()
+    engine_b = args.engine_b or get_engine_path()
+
+    runner = MatchRunner(engine_a, engine_b, args.games, args.time, load_openings(args.openings),
+                         args.concurrency, MatchStats(*args.sprt), args.stop_on_sprt, args.syzygy)
+
+    pgn_file = open(args.pgn, "w") if args.pgn else None
+
+    def on_game_finished(result, stats):
+        if pgn_file:
+            print(result["pgn"], end="\n\n", file=pgn_file, flush=True)
+        color = "white" if result["a_is_white"] else "black"
+        print(f"Game {stats.games()}/{args.games}: A ({color}) scored {result['a_score']} "
+              f"by {result['termination']} | {stats.summary()}")
+
+    try:
+        runner.run(on_game_finished)
+    finally:
+        if pgn_file:
+            pgn_file.close()
+
+    print(runner.stats.summary())
+    print(f"SPRT: {runner.stats.sprt_result() or 'inconclusive'}")
+
+
+if __name__ == "__main__":
+    main()
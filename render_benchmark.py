@@ -0,0 +1,311 @@
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+# No window and no sound card are needed, frames are drawn into SDL's dummy display
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import chess
+import chess.engine
+import pygame as pg
+from config import *
+from controller import BoardController
+from controller.file_path import get_resource_path
+from controller.move_animation import MoveAnimation
+from controller.profiler import profiler
+from controller.search_info import SearchInfo
+
+
+class OfflineController(BoardController):
+    """ BoardController without the engine process and the evaluation store, the benchmark only draws """
+    def load_engine(self, wait=True):
+        self.engine = None
+        self.engine_pool = None
+        self.engine_start = None
+
+    def open_evaluation_store(self):
+        return None
+
+
+def reset_controller(ctrl, fen):
+    with ctrl.board_lock:
+        ctrl.board.set_fen(fen)
+        ctrl.position_tracker.reset()
+        ctrl.move_index.invalidate()
+        ctrl.get_absent_pieces()
+        ctrl.game_status = GAME_PAUSED
+        ctrl.white_on_bottom = True
+        ctrl.white_clock = ctrl.black_clock = TIME_5_MINUTES
+        ctrl.source_square = None
+        ctrl.legal_moves_for_source_square = []
+        ctrl.source_square_display = None
+        ctrl.target_square_display = None
+        ctrl.active_animation = None
+        ctrl.secondary_animation = None
+        ctrl.pending_move = None
+        ctrl.is_promoting = False
+        ctrl.search_info_publisher.reset()
+
+
+class OpeningScene:
+    """ Starting position, nothing moves """
+    name = "opening"
+
+    def setup(self, ctrl):
+        reset_controller(ctrl, chess.STARTING_FEN)
+
+    def update(self, ctrl, frame):
+        pass
+
+
+class SelectionScene:
+    """ Queen selected in a middlegame, its 20 legal moves are shown """
+    name = "selection"
+
+    def setup(self, ctrl):
+        reset_controller(ctrl, "r3k2r/pp3ppp/2n2n2/8/3Q4/2N5/PP2BPPP/R1B1K2R w KQkq - 0 1")
+        with ctrl.board_lock:
+            ctrl.source_square = chess.D4
+            ctrl.get_legal_moves_for_source_square()
+            ctrl.source_square_display = chess.D1
+            ctrl.target_square_display = chess.D4
+
+    def update(self, ctrl, frame):
+        pass
+
+
+class PromotionScene:
+    """ Promotion table open, it dims the whole window so every frame is a full redraw """
+    name = "promotion"
+
+    def setup(self, ctrl):
+        reset_controller(ctrl, promotion_fen)
+        with ctrl.board_lock:
+            move = chess.Move(chess.A7, chess.A8)
+            ctrl.game_status = PLAYING
+            ctrl.source_square = move.from_square
+            ctrl.is_promoting = True
+            ctrl.pending_move = move
+            # The pawn waits on the last rank until a piece is chosen
+            ctrl.active_animation = MoveAnimation('P', ctrl.get_square_coords(move.from_square),
+                                                  ctrl.get_square_coords(move.to_square))
+            ctrl.active_animation.update(ctrl.active_animation.duration)
+
+    def update(self, ctrl, frame):
+        pass
+
+
+class LongPrincipalVariationScene:
+    """ Engine publishes a new snapshot with a long PV every frame """
+    name = "long pv"
+
+    def setup(self, ctrl):
+        reset_controller(ctrl, chess.STARTING_FEN)
+        # Same line on every run
+        rng = random.Random(0)
+        board = chess.Board()
+        self.principle_variation = []
+        while len(self.principle_variation) < 60 and not board.is_game_over():
+            move = rng.choice(list(board.legal_moves))
+            self.principle_variation.append(move)
+            board.push(move)
+
+    def update(self, ctrl, frame):
+        score = chess.engine.PovScore(chess.engine.Cp(frame % 200 - 100), chess.WHITE)
+        length = len(self.principle_variation) - frame % 10
+        ctrl.search_info_publisher.reset(SearchInfo(score, 10 + frame % 20, self.principle_variation[:length]))
+
+
+class CastlingScene:
+    """ King and rook slide to their castling squares, again and again """
+    name = "castling"
+
+    def setup(self, ctrl):
+        reset_controller(ctrl, white_rook_promotion)
+        self.start_castling(ctrl)
+
+    def start_castling(self, ctrl):
+        with ctrl.board_lock:
+            ctrl.start_move_animation(chess.Move(chess.E1, chess.G1))
+
+    def update(self, ctrl, frame):
+        # Animation steps without pushing the move, the position stays the same
+        ctrl.active_animation.update(1.0 / FPS)
+        ctrl.secondary_animation.update(1.0 / FPS)
+        if ctrl.active_animation.is_done and ctrl.secondary_animation.is_done:
+            self.start_castling(ctrl)
+
+
+SCENES = [OpeningScene(), SelectionScene(), PromotionScene(), LongPrincipalVariationScene(), CastlingScene()]
+MODES = ("full", "dirty") # Every widget redrawn each frame / only what the scene changed
+
+
+def draw_frames(board_view, renderer, scene, mode, frames, first_frame):
+    """ Frame times in seconds """
+    ctrl = board_view.controller
+    window = pg.display.get_surface()
+    frame_times = []
+    for frame in range(first_frame, first_frame + frames):
+        start = time.perf_counter()
+        scene.update(ctrl, frame)
+        ctrl.publish_state()
+        if mode == "full":
+            renderer.invalidate()
+        board_view.draw(window, renderer)
+        frame_times.append(time.perf_counter() - start)
+    return frame_times
+
+
+def measure(board_view, renderer, scene, mode, frames, warmup):
+    """ Timing, per widget cost and allocations of one scene, every pass with the same frame numbers """
+    scene.setup(board_view.controller)
+    renderer.invalidate()
+    draw_frames(board_view, renderer, scene, mode, warmup, 0)
+
+    # 1. Frame rate, nothing else is measured
+    frame_times = sorted(draw_frames(board_view, renderer, scene, mode, frames, warmup))
+
+    # 2. Per widget cost from the profiler stages of the dirty renderer
+    profiler.set_enabled(True)
+    draw_frames(board_view, renderer, scene, mode, frames, warmup)
+    widgets = {}
+    for name, (count, p50, p95, maximum) in profiler.stats().items():
+        # The overlay only shows up because this pass enables the profiler
+        if name.startswith("draw ") and name != "draw profiler":
+            widgets[name[len("draw "):]] = {"count": count, "p50_ms": round(p50, 4)}
+    profiler.set_enabled(False)
+
+    # 3. Python allocations. Peak is what one frame allocates on top of what was alive before it,
+    # retained blocks are objects a frame leaves behind (caches filling up, leaks)
+    allocation_frames = max(1, frames // 5)
+    tracemalloc.start()
+    peaks = []
+    blocks_before = sys.getallocatedblocks()
+    for frame in range(warmup, warmup + allocation_frames):
+        tracemalloc.reset_peak()
+        current, _ = tracemalloc.get_traced_memory()
+        draw_frames(board_view, renderer, scene, mode, 1, frame)
+        peaks.append(tracemalloc.get_traced_memory()[1] - current)
+    blocks_after = sys.getallocatedblocks()
+    tracemalloc.stop()
+
+    total = sum(frame_times)
+    return {
+        "fps": round(len(frame_times) / total, 1),
+        "p50_ms": round(frame_times[len(frame_times) // 2] * 1000, 3),
+        "p95_ms": round(frame_times[int(len(frame_times) * 0.95)] * 1000, 3),
+        "peak_kb": round(sum(peaks) / len(peaks) / 1024, 1),
+        "retained_blocks": round((blocks_after - blocks_before) / allocation_frames, 1),
+        "widgets": widgets
+    }
+
+
+def print_results(results):
+    print(f"{'scene':<11}{'mode':<7}{'fps':>9}{'p50 ms':>9}{'p95 ms':>9}{'peak KB':>9}{'blocks':>8}")
+    for scene_name, modes in results.items():
+        for mode, result in modes.items():
+            print(f"{scene_name:<11}{mode:<7}{result['fps']:>9.1f}{result['p50_ms']:>9.3f}{result['p95_ms']:>9.3f}"
+                  f"{result['peak_kb']:>9.1f}{result['retained_blocks']:>8.1f}")
+
+    print("\nWidget cost, p50 ms per redraw (full mode):")
+    widget_names = []
+    for modes in results.values():
+        for name in modes.get("full", {}).get("widgets", {}):
+            if name not in widget_names:
+                widget_names.append(name)
+    print(f"{'':<21}" + "".join(f"{scene_name:>11}" for scene_name in results))
+    for name in widget_names:
+        costs = []
+        for modes in results.values():
+            widget = modes.get("full", {}).get("widgets", {}).get(name)
+            costs.append(f"{widget['p50_ms']:>11.3f}" if widget else f"{'-':>11}")
+        print(f"{name:<21}" + "".join(costs))
+
+
+def compare_with_baseline(results, baseline, threshold):
+    """ Lines describing every regression beyond threshold, empty when there is none """
+    regressions = []
+    for scene_name, modes in results.items():
+        for mode, result in modes.items():
+            old = baseline.get("results", {}).get(scene_name, {}).get(mode)
+            if old is None:
+                continue
+            if result["fps"] < old["fps"] * (1 - threshold):
+                regressions.append(f"{scene_name} {mode}: {result['fps']:.1f} fps, baseline {old['fps']:.1f}")
+            # A few KB of slack, small frames would flag any noise otherwise
+            if result["peak_kb"] > old["peak_kb"] * (1 + threshold) + 4:
+                regressions.append(f"{scene_name} {mode}: {result['peak_kb']:.1f} KB peak, baseline {old['peak_kb']:.1f}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless rendering benchmark of the board view, no engine is started")
+    parser.add_argument("--frames", type=int, default=300, help="measured frames per scene and mode")
+    parser.add_argument("--warmup", type=int, default=30, help="frames drawn before measuring, caches fill up here")
+    parser.add_argument("--scenes", nargs="+", choices=[scene.name for scene in SCENES], help="default: all scenes")
+    parser.add_argument("--baseline", help="baseline JSON (default: render_benchmark.json next to main.py)")
+    parser.add_argument("--save-baseline", action="store_true", help="store this run as the new baseline")
+    parser.add_argument("--threshold", type=float, default=0.15, help="allowed slowdown before a regression is reported")
+    args = parser.parse_args()
+
+    pg.init()
+    window = pg.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+
+    # Imported after the display exists, like in MainWindow
+    from view.board_view import BoardView
+    from view.dirty_renderer import DirtyRenderer
+    from view.asset_manager import assets
+
+    board_view = BoardView(OfflineController())
+    background = assets.get_scaled(os.path.join("pics", "texture-background.bmp"), (SCREEN_WIDTH, SCREEN_HEIGHT),
+                                   alpha=False, smooth=False)
+    renderer = DirtyRenderer(background)
+
+    results = {}
+    for scene in SCENES:
+        if args.scenes and scene.name not in args.scenes:
+            continue
+        results[scene.name] = {mode: measure(board_view, renderer, scene, mode, args.frames, args.warmup)
+                               for mode in MODES}
+
+    board_view.controller.shut_down_engine()
+    pg.quit()
+
+    print_results(results)
+
+    baseline_path = args.baseline or get_resource_path("render_benchmark.json")
+    if args.save_baseline:
+        environment = {"python": platform.python_version(), "pygame": pg.version.ver,
+                       "machine": platform.machine(), "frames": args.frames}
+        with open(baseline_path, "w") as file:
+            json.dump({"environment": environment, "results": results}, file, indent=2)
+        print(f"\nSaved the baseline to: {baseline_path}")
+        return
+
+    if not os.path.exists(baseline_path):
+        print(f"\nNo baseline at {baseline_path}, run with --save-baseline to create one")
+        return
+
+    with open(baseline_path) as file:
+        baseline = json.load(file)
+    if baseline.get("environment", {}).get("pygame") != pg.version.ver:
+        print(f"\nBaseline was measured with pygame {baseline.get('environment', {}).get('pygame')}, numbers may differ")
+
+    regressions = compare_with_baseline(results, baseline, args.threshold)
+    if regressions:
+        print(f"\nRegressions against {baseline_path} (threshold {args.threshold:.0%}):")
+        for line in regressions:
+            print(f"  {line}")
+        sys.exit(1)
+    print(f"\nNo regressions against {baseline_path} (threshold {args.threshold:.0%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+import hashlib
+import json
+import os
+import struct
+import time
+import pygame as pg
+from config import *
+from controller import get_resource_path
+from .asset_manager import assets
+
+BUNDLE_VERSION = 1
+BUNDLE_MAGIC = b"CGAB"
+
+PIECE_FILES = {
+    'P': "white-pawn.png", 'N': "white-knight.png", 'B': "white-bishop.png",
+    'R': "white-rook.png", 'Q': "white-queen.png", 'K': "white-king.png",
+    'p': "black-pawn.png", 'n': "black-knight.png", 'b': "black-bishop.png",
+    'r': "black-rook.png", 'q': "black-queen.png", 'k': "black-king.png"
+}
+
+
+def get_manifest():
+    """ Every (relative path, size, alpha, smooth, opacity) variant the views ask the asset manager for """
+    manifest = []
+    for symbol, filename in PIECE_FILES.items():
+        path = os.path.join('pics', filename)
+        manifest.append((path, (PIECE_SIZE, PIECE_SIZE), True, True, None)) # board
+        if symbol not in ('K', 'k'):
+            manifest.append((path, (MATERIAL_SCORE_WIDTH, MATERIAL_SCORE_WIDTH), True, True, None)) # material table
+        if symbol not in ('K', 'k', 'P', 'p'):
+            manifest.append((path, (PROMOTION_TABLE_CELL_WIDTH, PROMOTION_TABLE_CELL_HEIGHT), True, True, None)) # promotion
+
+    buttons = [
+        (BUTTON_START, PLAY_BUTTON_WIDTH, PLAY_BUTTON_HEIGHT),
+        (BUTTON_STOP, PAUSE_BUTTON_WIDTH, PAUSE_BUTTON_HEIGHT),
+        (DEFAULT_BUTTON, TIME_BUTTON_1_WIDTH, TIME_BUTTON_1_HEIGHT),
+        (DEFAULT_BUTTON, CHANGE_SIDE_BUTTON_WIDTH, CHANGE_SIDE_BUTTON_HEIGHT),
+    ]
+    for filename, width, height in buttons:
+        manifest.append((os.path.join('pics', filename), (width, height), True, False, 150))
+
+    manifest.append((os.path.join("pics", "texture-background.bmp"), (SCREEN_WIDTH, SCREEN_HEIGHT), False, False, None))
+
+    # Same int sizes the asset manager uses in its keys, without duplicates
+    unique = []
+    for path, size, alpha, smooth, opacity in manifest:
+        entry = (path, (int(size[0]), int(size[1])), alpha, smooth, opacity)
+        if entry not in unique:
+            unique.append(entry)
+    return unique
+
+
+def get_bundle_hash(manifest):
+    """ Changes with the bundle format, pygame, the configured sizes or the content of any source image """
+    digest = hashlib.sha1()
+    digest.update(f"{BUNDLE_VERSION} {pg.version.ver}".encode())
+    for path, size, alpha, smooth, opacity in manifest:
+        digest.update(repr((path.replace(os.sep, "/"), size, alpha, smooth, opacity)).encode())
+    for path in sorted(set(entry[0] for entry in manifest)):
+        with open(get_resource_path(path), "rb") as file:
+            digest.update(file.read())
+    return digest.hexdigest()
+
+
+def build_bundle(bundle_path):
+    """ Scale every manifest entry and write the raw pixels in one file. Needs a display mode for convert() """
+    manifest = get_manifest()
+    entries = []
+    pixels = []
+    offset = 0
+    for path, size, alpha, smooth, opacity in manifest:
+        # Opacity is a surface setting, it is applied again on load
+        surface = assets.get_scaled(path, size, alpha, smooth)
+        pixel_format = "RGBA" if alpha else "RGB"
+        data = pg.image.tobytes(surface, pixel_format)
+        entries.append({
+            "path": path.replace(os.sep, "/"), "size": list(size), "alpha": alpha, "smooth": smooth,
+            "opacity": opacity, "format": pixel_format, "offset": offset, "length": len(data)
+        })
+        pixels.append(data)
+        offset += len(data)
+
+    header = json.dumps({"hash": get_bundle_hash(manifest), "entries": entries}).encode()
+    with open(bundle_path, "wb") as file:
+        file.write(BUNDLE_MAGIC)
+        file.write(struct.pack("<I", len(header)))
+        file.write(header)
+        for data in pixels:
+            file.write(data)
+    return len(entries), offset
+
+
+def load_bundle(bundle_path):
+    """
+    Fill the asset manager from the bundle with one read. Returns the number of loaded variants,
+    0 when the bundle is missing or stale, then the views decode the source images as usual.
+    """
+    start = time.perf_counter()
+    try:
+        with open(bundle_path, "rb") as file:
+            data = file.read()
+    except OSError:
+        return 0
+
+    try:
+        if data[:4] != BUNDLE_MAGIC:
+            raise ValueError("unknown format")
+        header_length = struct.unpack("<I", data[4:8])[0]
+        header = json.loads(data[8:8 + header_length])
+
+        if header["hash"] != get_bundle_hash(get_manifest()):
+            print("Asset bundle is stale, run build_assets.py again. Loading the images instead")
+            return 0
+
+        pixels = memoryview(data)[8 + header_length:]
+        variants = []
+        for entry in header["entries"]:
+            buffer = pixels[entry["offset"]:entry["offset"] + entry["length"]]
+            surface = pg.image.frombuffer(buffer, tuple(entry["size"]), entry["format"])
+            # convert() copies into the display format, so the file buffer can be released
+            surface = surface.convert_alpha() if entry["alpha"] else surface.convert()
+            if entry["opacity"] is not None:
+                surface.set_alpha(entry["opacity"])
+            variants.append((entry, surface))
+    except (OSError, ValueError, KeyError, struct.error) as e:
+        print(f"Ignoring broken asset bundle {bundle_path}: {e}")
+        return 0
+
+    for entry, surface in variants:
+        path = os.path.join(*entry["path"].split("/"))
+        assets.add_variant(path, entry["size"], entry["alpha"], entry["smooth"], entry["opacity"], surface)
+
+    assets.bundle_load_time = time.perf_counter() - start
+    return len(header["entries"])
@@ -0,0 +1,114 @@
+import threading
+import time
+import pygame as pg
+from controller import get_resource_path
+
+
+class AssetManager:
+    """
+    Decodes every image file once and memoizes its scaled variants by (path, size, alpha, smooth, opacity),
+    and sprites the views draw themselves (indicators, highlights, overlays) by a key of name, size and color.
+    Views get shared surfaces, so they must not draw on them or change their alpha.
+    Safe to use from the loading thread and the main thread at the same time.
+    """
+    def __init__(self):
+        self.images = {}   # absolute path -> decoded and converted surface
+        self.variants = {} # (path, size, alpha, smooth, opacity) -> scaled surface
+        self.sprites = {}  # (name, size, color, ...) -> surface drawn by a view
+        self.assets_lock = threading.Lock()
+
+        # load statistics
+        self.decodes = 0
+        self.decode_time = 0.0
+        self.variant_hits = 0
+        self.variant_misses = 0
+        self.scale_time = 0.0
+        self.bundle_variants = 0
+        self.bundle_load_time = 0.0
+        self.sprite_hits = 0
+        self.sprite_misses = 0
+
+    def get_image(self, relative_path, alpha=True):
+        """ Decoded image in its original size. Needs the display mode to be set, for convert() """
+        path = get_resource_path(relative_path)
+        key = (path, alpha)
+        with self.assets_lock:
+            image = self.images.get(key)
+        if image is not None:
+            return image
+
+        # Decode outside the lock, so different files can load in parallel
+        start = time.perf_counter()
+        raw_image = pg.image.load(path)
+        image = raw_image.convert_alpha() if alpha else raw_image.convert()
+        elapsed = time.perf_counter() - start
+
+        with self.assets_lock:
+            self.decodes += 1
+            self.decode_time += elapsed
+            # Another thread may have been faster, keep the first surface
+            return self.images.setdefault(key, image)
+
+    def get_scaled(self, relative_path, size, alpha=True, smooth=True, opacity=None):
+        """ Image scaled to size. opacity sets a per-surface alpha (0 - 255) on this variant only """
+        size = (int(size[0]), int(size[1]))
+        key = (get_resource_path(relative_path), size, alpha, smooth, opacity)
+        with self.assets_lock:
+            variant = self.variants.get(key)
+            if variant is not None:
+                self.variant_hits += 1
+                return variant
+
+        image = self.get_image(relative_path, alpha)
+        start = time.perf_counter()
+        if smooth:
+            variant = pg.transform.smoothscale(image, size)
+        else:
+            variant = pg.transform.scale(image, size)
+        if opacity is not None:
+            variant.set_alpha(opacity)
+        elapsed = time.perf_counter() - start
+
+        with self.assets_lock:
+            self.variant_misses += 1
+            self.scale_time += elapsed
+            return self.variants.setdefault(key, variant)
+
+    def get_sprite(self, key, build):
+        """ Surface returned by build() the first time key is asked for, the key must hold everything it depends on """
+        with self.assets_lock:
+            sprite = self.sprites.get(key)
+            if sprite is not None:
+                self.sprite_hits += 1
+                return sprite
+
+        sprite = build()
+        with self.assets_lock:
+            self.sprite_misses += 1
+            return self.sprites.setdefault(key, sprite)
+
+    def add_variant(self, relative_path, size, alpha, smooth, opacity, surface):
+        """ Store a variant that was prepared elsewhere, like the pre-scaled asset bundle """
+        key = (get_resource_path(relative_path), (int(size[0]), int(size[1])), alpha, smooth, opacity)
+        with self.assets_lock:
+            self.variants[key] = surface
+            self.bundle_variants += 1
+
+    def stats(self):
+        with self.assets_lock:
+            return {
+                "decoded_files": self.decodes,
+                "decode_time": self.decode_time,
+                "variants": len(self.variants),
+                "variant_hits": self.variant_hits,
+                "variant_misses": self.variant_misses,
+                "scale_time": self.scale_time,
+                "bundle_variants": self.bundle_variants,
+                "bundle_load_time": self.bundle_load_time,
+                "sprites": len(self.sprites),
+                "sprite_hits": self.sprite_hits,
+                "sprite_misses": self.sprite_misses,
+            }
+
+
+assets = AssetManager()
@@ -3,18 +3,25 @@ import pygame as pg
 from controller import BoardController, get_resource_path
 import os
 import chess
+import time
 from .promotion_table_view import PromotionTableView
 from .material_score_table_view import MaterialScoreTableView
 from .time_view import TimeView
 from .game_status_view import GameStatusView
 from .search_info_view import SearchInfoView
 from .button import Button
+from .text_cache import text_cache
+from .asset_manager import assets
+from .profiler_overlay import ProfilerOverlay
+from .event_dispatcher import HitRegion
+from .sound_player import SoundPlayer
 
 class BoardView:
-    def __init__(self):
+    def __init__(self, controller=None):
         pg.font.init()
         
-        self.controller = BoardController()
+        # MainWindow builds the controller itself, in parallel with the images
+        self.controller = controller or BoardController(sounds=SoundPlayer())
 
         self.pieces_images = {
             'P': None, 'N': None, 'B': None, 'R': None, 'Q': None, 'K': None,
@@ -29,6 +36,7 @@ class BoardView:
         self.time_table = TimeView()
         self.status_table = GameStatusView()
         self.search_table = SearchInfoView()
+        self.profiler_overlay = ProfilerOverlay()
         
         # Buttons
         self.play_button = Button(PLAY_BUTTON_X, PLAY_BUTTON_Y, PLAY_BUTTON_WIDTH, PLAY_BUTTON_HEIGHT, self.controller.play_game, "Start new game", BUTTON_START)
@@ -37,9 +45,74 @@ class BoardView:
         self.five_minutes_button = Button(TIME_BUTTON_2_X, TIME_BUTTON_2_Y, TIME_BUTTON_2_WIDTH, TIME_BUTTON_2_HEIGHT, self.controller.set_time_5_minutes, "5 minutes")
         self.ten_minutes_button = Button(TIME_BUTTON_3_X, TIME_BUTTON_3_Y, TIME_BUTTON_3_WIDTH, TIME_BUTTON_3_HEIGHT, self.controller.set_time_10_minutes, "10 minutes")
         self.change_side_button = Button(CHANGE_SIDE_BUTTON_X, CHANGE_SIDE_BUTTON_Y, CHANGE_SIDE_BUTTON_WIDTH, CHANGE_SIDE_BUTTON_HEIGHT, self.controller.change_board_orientation, "Change side")
+        self.buttons = {
+            "play_button": self.play_button, "pause_button": self.pause_button,
+            "one_minutes_button": self.one_minutes_button, "five_minutes_button": self.five_minutes_button,
+            "ten_minutes_button": self.ten_minutes_button, "change_side_button": self.change_side_button
+        }
+
+        # White frame around the squares with the file and rank letters, nothing of the board is drawn outside it
+        self.board_frame_rect = pg.Rect(BOARD_X - BOARD_MARGIN, BOARD_Y - BOARD_MARGIN,
+                                        BOARD_WIDTH + 2 * BOARD_MARGIN, BOARD_HEIGHT + 2 * BOARD_MARGIN)
+        # Screen areas for the dirty rect renderer, a bit wider than the board frame for the file letters
+        self.board_rect = self.board_frame_rect.inflate(8, 8)
+        self.turn_indicator_rect = pg.Rect(TURN_INDICATOR_X - TURN_INDICATOR_RADIUS, TURN_INDICATOR_Y - TURN_INDICATOR_RADIUS,
+                                           2 * TURN_INDICATOR_RADIUS, 2 * TURN_INDICATOR_RADIUS)
+        self.was_promoting = False
+
+        # (white_on_bottom, board position and size) -> squares, frame and coordinates rendered once
+        self.board_layers = {}
+
+        # white_on_bottom -> top left corner of every square and of the piece standing on it,
+        # relative to board_frame_rect because that is where the composite board is drawn
+        piece_offset = (SQUARE_SIZE - PIECE_SIZE) // 2
+        self.square_corners = {}
+        self.piece_positions = {}
+        for white_on_bottom in (True, False):
+            corners = [self.get_square_coords(square, white_on_bottom) for square in chess.SQUARES]
+            self.square_corners[white_on_bottom] = [(x - self.board_frame_rect.x, y - self.board_frame_rect.y)
+                                                    for x, y in corners]
+            self.piece_positions[white_on_bottom] = [(x + piece_offset, y + piece_offset)
+                                                     for x, y in self.square_corners[white_on_bottom]]
+
+        # Static board with highlights and the pieces that stand still, rebuilt only when one of them changes
+        self.board_composite_key = None
+        self.board_composite = None
 
-        self.white_indicator = self.create_smooth_indicator(WHITE)
-        self.black_indicator = self.create_smooth_indicator(BLACK)
+        self.white_indicator = assets.get_sprite(("turn indicator", TURN_INDICATOR_RADIUS, WHITE),
+                                                 lambda: self.create_smooth_indicator(WHITE))
+        self.black_indicator = assets.get_sprite(("turn indicator", TURN_INDICATOR_RADIUS, BLACK),
+                                                 lambda: self.create_smooth_indicator(BLACK))
+
+    def register_hit_regions(self, dispatcher):
+        """ Buttons, the board squares and the promotion cells get their mouse events from the dispatcher """
+        for name, button in self.buttons.items():
+            dispatcher.add_region(HitRegion(name, button.rect, button.handle_mouse, on_leave=button.on_leave))
+
+        ctrl = self.controller
+        # One region per square on the screen, the chess square under it depends on the orientation
+        for column in range(8):
+            for row in range(8):
+                dispatcher.add_region(HitRegion(f"square {column} {row}",
+                                                (BOARD_X + column * SQUARE_SIZE, BOARD_Y + row * SQUARE_SIZE,
+                                                 SQUARE_SIZE, SQUARE_SIZE),
+                                                lambda event, column=column, row=row:
+                                                    self.is_left_mouse_button_down(event) and
+                                                    ctrl.handle_click(self.get_square_on_screen(column, row)),
+                                                enabled=lambda: not ctrl.is_promoting))
+
+        # Same order as the pieces drawn by the promotion table
+        for index, piece_type in enumerate((chess.QUEEN, chess.ROOK, chess.KNIGHT, chess.BISHOP)):
+            dispatcher.add_region(HitRegion(f"promotion {chess.piece_name(piece_type)}",
+                                            (PROMOTION_TABLE_X + index * PROMOTION_TABLE_CELL_WIDTH, PROMOTION_TABLE_Y,
+                                             PROMOTION_TABLE_CELL_WIDTH, PROMOTION_TABLE_CELL_HEIGHT),
+                                            lambda event, piece_type=piece_type:
+                                                self.is_left_mouse_button_down(event) and
+                                                ctrl.choose_promotion_piece(piece_type),
+                                            enabled=lambda: ctrl.is_promoting, priority=1))
+
+    def is_left_mouse_button_down(self, event):
+        return event.type == pg.MOUSEBUTTONDOWN and event.button == 1
 
     def load_pictures(self):
         # Mapping of piece symbols to filenames
@@ -60,48 +133,138 @@ class BoardView:
                 print(f"Warning: Missing image for {symbol} at {path}")
                 continue
 
-            # Load, scale, and convert
-            img = pg.image.load(path)
-            self.pieces_images[symbol] = pg.transform.smoothscale(img, (PIECE_SIZE, PIECE_SIZE)).convert_alpha()
-
-    def draw(self, win):
-        # 1. Background and Board Structure
-        self.draw_board_background(win)
-        self.draw_board(win)
-        self.show_files_ranks(win)
-
-        with self.controller.board_lock:
-            # 2. Highlights and Visual Indicators
-            self.draw_square_in_check(win)
-            self.draw_made_move(win)
-            self.draw_legal_moves_for_source_square(win)
-
-            # 3. Draw Pieces
-            self.draw_pieces_with_animation(win)
-
-            # 4. Tables and Info
-            self.material_table.draw(win, self.controller.absent_pices_num)
-            self.draw_circle_indicating_turn(win)
-            self.time_table.draw(win, self.controller.white_clock, self.controller.black_clock)
-            self.status_table.draw(win, self.controller.game_status) 
-            self.search_table.draw(win, self.controller.search_info)
-
-        # 5. UI Buttons
-        self.play_button.draw(win)
-        self.pause_button.draw(win)
-        self.one_minutes_button.draw(win)
-        self.five_minutes_button.draw(win)
-        self.ten_minutes_button.draw(win)
-        self.change_side_button.draw(win)
-
-        # 6. Overlays (Promotion needs to be on top of everything)
+            # Decoded once and scaled once, shared with every other view
+            self.pieces_images[symbol] = assets.get_scaled(os.path.join('pics', filename), (PIECE_SIZE, PIECE_SIZE))
+
+    def draw(self, win, renderer):
+        # Everything comes from the latest published snapshots, board_lock is never taken here
+        state = self.controller.game_state
+
+        # A promotion dims the whole window, while it is open and right after it closes everything is redrawn
+        if state.is_promoting or self.was_promoting:
+            renderer.invalidate()
+        self.was_promoting = state.is_promoting
+
+        renderer.begin_frame(win)
+
+        # 1. Board, highlights and pieces
+        renderer.draw_layer(win, "board", self.board_rect, state.get_board_key(),
+                            lambda win: self.draw_board_layer(win, state))
+
+        # 2. Tables and Info
+        renderer.draw_layer(win, "material", self.material_table.rect, state.absent_pieces,
+                            lambda win: self.material_table.draw(win, dict(state.absent_pieces)))
+        renderer.draw_layer(win, "turn", self.turn_indicator_rect, state.turn,
+                            lambda win: self.draw_circle_indicating_turn(win, state.turn))
+
+        time_state = (self.time_table.format_time(state.white_clock), self.time_table.format_time(state.black_clock))
+        renderer.draw_layer(win, "time", self.time_table.rect, time_state,
+                            lambda win: self.time_table.draw(win, state.white_clock, state.black_clock))
+
+        renderer.draw_layer(win, "status", self.status_table.rect, state.game_status,
+                            lambda win: self.status_table.draw(win, state.game_status))
+
+        # A new search info snapshot means new content
+        search_info = self.controller.search_info
+        renderer.draw_layer(win, "search", self.search_table.draw_rect, search_info,
+                            lambda win: self.search_table.draw(win, search_info))
+
+        # 3. UI Buttons
+        for name, button in self.buttons.items():
+            renderer.draw_layer(win, name, button.rect, button.color, button.draw)
+
+        # 4. Overlays (Promotion needs to be on top of everything)
+        renderer.draw_layer(win, "profiler", self.profiler_overlay.rect, self.profiler_overlay.get_state(time.time()),
+                            self.profiler_overlay.draw)
+        self.promotion_table.draw(win, state.is_promoting, state.turn)
+
+        renderer.end_frame()
+
+    def get_square_on_screen(self, column, row):
+        """ Chess square drawn in the column and row of the board, counted from the top left """
+        if self.controller.white_on_bottom:
+            return chess.square(column, 7 - row)
+        return chess.square(7 - column, row)
+
+    def get_square_coords(self, square, white_on_bottom):
+        """ Top left corner of the square on the screen """
+        file = chess.square_file(square)
+        rank = chess.square_rank(square)
+        if not white_on_bottom:
+            file = 7 - file
+            rank = 7 - rank
+        return BOARD_X + file * SQUARE_SIZE, BOARD_Y + (7 - rank) * SQUARE_SIZE
+
+    def get_static_board_layer(self, white_on_bottom):
+        key = (white_on_bottom, BOARD_X, BOARD_Y, SQUARE_SIZE)
+        layer = self.board_layers.get(key)
+        if layer is None:
+            # Draw with the usual screen coordinates, then keep only the board area
+            canvas = pg.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pg.SRCALPHA)
+            self.draw_board_background(canvas)
+            self.draw_board(canvas, white_on_bottom)
+            self.show_files_ranks(canvas, white_on_bottom)
+            layer = canvas.subsurface(self.board_rect).copy()
+            self.board_layers[key] = layer
+        return layer
+
+    def draw_board_layer(self, win, state):
+        win.blit(self.get_board_composite(state), self.board_frame_rect)
+        self.draw_animated_pieces(win, state)
         pg.draw.rect(win, GRAY, (BOARD_X, BOARD_Y, BOARD_WIDTH, BOARD_HEIGHT), 2)
-        self.promotion_table.draw(win, self.controller.is_promoting, self.controller.board.turn)
 
-    def draw_board(self, win):
+    def get_hidden_squares(self, state):
+        """ Squares whose pieces are drawn by the animation instead """
+        if not state.pending_move:
+            return ()
+        # The moving piece (the King in castling), and the Rook's starting square when castling
+        if state.is_pending_castling:
+            rook_start_sq, _ = self.controller.castle_map[state.pending_move.to_square]
+            return (state.pending_move.from_square, rook_start_sq)
+        return (state.pending_move.from_square,)
+
+    def get_board_composite(self, state):
+        """ Squares, highlights and static pieces in one opaque surface over board_frame_rect, it only changes between moves """
+        hidden_squares = self.get_hidden_squares(state)
+        key = (state.position, state.white_on_bottom, state.checked_kings, state.source_square_display,
+               state.target_square_display, state.legal_targets, hidden_squares)
+        if key == self.board_composite_key:
+            return self.board_composite
+
+        corners = self.square_corners[state.white_on_bottom]
+        sequence = [(self.get_check_highlight(), corners[square]) for square in state.checked_kings]
+
+        if state.source_square_display and state.target_square_display:
+            frame = self.get_made_move_frame()
+            sequence += [(frame, corners[state.source_square_display]), (frame, corners[state.target_square_display])]
+
+        indicator = self.get_move_indicator()
+        sequence += [(indicator, corners[square]) for square in state.legal_targets]
+
+        # Pieces on top of the highlights, without the ones currently in motion
+        positions = self.piece_positions[state.white_on_bottom]
+        sequence += [(self.pieces_images[symbol], positions[square]) for square, symbol in state.pieces
+                     if square not in hidden_squares and self.pieces_images.get(symbol)]
+
+        # Without per pixel alpha the composite is copied to the window instead of blended
+        frame_rect = self.board_frame_rect.move(-self.board_rect.x, -self.board_rect.y)
+        composite = self.get_static_board_layer(state.white_on_bottom).subsurface(frame_rect).convert()
+        composite.blits(sequence, doreturn=False)
+        self.board_composite_key = key
+        self.board_composite = composite
+        return composite
+
+    def draw_animated_pieces(self, win, state):
+        """ The King first and then the Rook, in screen coordinates """
+        offset = (SQUARE_SIZE - PIECE_SIZE) // 2
+        sequence = [(self.pieces_images[symbol], (x + offset, y + offset)) for symbol, (x, y) in state.animations
+                    if self.pieces_images.get(symbol)]
+        win.blits(sequence, doreturn=False)
+
+    def draw_board(self, win, white_on_bottom):
         for rank in range(8):
             for file in range(8):
-                if self.controller.white_on_bottom:
+                if white_on_bottom:
                     row, col = 7 - rank, file
                 else:
                     row, col = rank, 7 - file
@@ -109,49 +272,24 @@ class BoardView:
                 color = WHITE_SQUARE_COLOR if (rank + file) % 2 == 1 else BLACK_SQUARE_COLOR
                 pg.draw.rect(win, color, (BOARD_X + col * SQUARE_SIZE, BOARD_Y + row * SQUARE_SIZE, SQUARE_SIZE, SQUARE_SIZE))
 
-    def draw_pieces_with_animation(self, win):
-        """Combined method to handle static pieces, the primary piece, and secondary pieces (like Rooks in castling)."""
-        hidden_squares = []
-        
-        # 1. Identify which squares are 'empty' because pieces are moving
-        if self.controller.pending_move:
-            # Hide the primary piece (usually the King in castling)
-            hidden_squares.append(self.controller.pending_move.from_square)
-            
-            # If it's a castle, we also need to hide the Rook's starting square
-            if self.controller.board.is_castling(self.controller.pending_move):
-                # Map King's destination to the Rook's original position
-                rook_start_sq = self.controller.castle_map.get(self.controller.pending_move.to_square)
-                if rook_start_sq is not None:
-                    hidden_squares.append(rook_start_sq)
-
-        # 2. Draw all static pieces
-        for square, piece in self.controller.board.piece_map().items():
-            if square in hidden_squares:
-                continue  # Don't draw pieces currently in motion
-            
-            piece_image = self.pieces_images.get(piece.symbol())
-            if piece_image:
-                x, y = self.controller.get_square_coords(square)
-                offset = (SQUARE_SIZE - PIECE_SIZE) // 2
-                win.blit(piece_image, (x + offset, y + offset))
+    def get_move_indicator(self):
+        return assets.get_sprite(("move indicator", SQUARE_SIZE, HIGHLIGHT_COLOR), self._create_move_indicator)
 
-        # 3. Draw the primary animating piece (King)
-        if self.controller.active_animation:
-            self._draw_anim_helper(win, self.controller.active_animation)
+    def get_check_highlight(self):
+        return assets.get_sprite(("check highlight", SQUARE_SIZE, HIGHLIGHT_COLOR), self._create_check_highlight)
 
-        # 4. Draw the secondary animating piece (Rook)
-        if self.controller.secondary_animation:
-            self._draw_anim_helper(win, self.controller.secondary_animation)
+    def get_made_move_frame(self):
+        return assets.get_sprite(("made move frame", SQUARE_SIZE, RED), self._create_made_move_frame)
 
+    def _create_check_highlight(self):
+        surf = pg.Surface((SQUARE_SIZE, SQUARE_SIZE))
+        surf.fill(HIGHLIGHT_COLOR)
+        return surf
 
-    def _draw_anim_helper(self, win, anim):
-        """Helper to render a single animation object."""
-        anim_img = self.pieces_images.get(anim.piece_symbol)
-        if anim_img:
-            offset = (SQUARE_SIZE - PIECE_SIZE) // 2
-            win.blit(anim_img, (anim.current_pos.x + offset, anim.current_pos.y + offset))
-
+    def _create_made_move_frame(self):
+        surf = pg.Surface((SQUARE_SIZE, SQUARE_SIZE), pg.SRCALPHA)
+        pg.draw.rect(surf, RED, (0, 0, SQUARE_SIZE, SQUARE_SIZE), 5)
+        return surf
 
     def _create_move_indicator(self):
         n = 4
@@ -163,29 +301,16 @@ class BoardView:
     
         return pg.transform.smoothscale(surf, (SQUARE_SIZE, SQUARE_SIZE))
 
-    def draw_legal_moves_for_source_square(self, win):
-        for move in self.controller.legal_moves_for_source_square:
-            to_square = move.to_square
-            rank, file = to_square // 8, to_square % 8
-            row, col = (7 - rank, file) if self.controller.white_on_bottom else (rank, 7 - file)
-            # center = (BOARD_X + col * SQUARE_SIZE + SQUARE_SIZE // 2, BOARD_Y + row * SQUARE_SIZE + SQUARE_SIZE // 2)
-            # pg.draw.circle(win, HIGHLIGHT_COLOR, center, SQUARE_SIZE // 2, SQUARE_SIZE // 15)
-            x = BOARD_X + col * SQUARE_SIZE
-            y = BOARD_Y + row * SQUARE_SIZE
-    
-            indicator = self._create_move_indicator()
-            win.blit(indicator, (x, y))
-
-    def show_files_ranks(self, win):
+    def show_files_ranks(self, win, white_on_bottom):
         for i in range(8):
             file_char, rank_char = chr(ord('a') + i), str(8 - i)
-            f_text = self.font.render(file_char, True, FONT_COLOR)
-            r_text = self.font.render(rank_char, True, FONT_COLOR)
+            f_text = text_cache.render(self.font, file_char, FONT_COLOR)
+            r_text = text_cache.render(self.font, rank_char, FONT_COLOR)
             
-            idx = i if self.controller.white_on_bottom else (7 - i)
+            idx = i if white_on_bottom else (7 - i)
             win.blit(f_text, (BOARD_X + idx * SQUARE_SIZE + SQUARE_SIZE // 2 - f_text.get_width() // 2, BOARD_Y + BOARD_HEIGHT - f_text.get_height() // 8))
             
-            idy = i if self.controller.white_on_bottom else (7 - i)
+            idy = i if white_on_bottom else (7 - i)
             win.blit(r_text, (BOARD_X - r_text.get_width() * 4 // 3, BOARD_Y + idy * SQUARE_SIZE + SQUARE_SIZE // 2 - r_text.get_height() // 2))
 
     def create_smooth_indicator(self, fill_color):
@@ -201,33 +326,17 @@ class BoardView:
         # Smoothly scale down to the target size
         return pg.transform.smoothscale(surf, (TURN_INDICATOR_RADIUS * 2, TURN_INDICATOR_RADIUS * 2))
 
-    def draw_circle_indicating_turn(self, win):
+    def draw_circle_indicating_turn(self, win, turn):
         # color = WHITE if self.controller.board.turn == chess.WHITE else BLACK
         # pg.draw.circle(win, color, (TURN_INDICATOR_X, TURN_INDICATOR_Y), TURN_INDICATOR_RADIUS)
         # pg.draw.circle(win, BLACK, (TURN_INDICATOR_X, TURN_INDICATOR_Y), TURN_INDICATOR_RADIUS, 2)
         top_left = (TURN_INDICATOR_X - TURN_INDICATOR_RADIUS, 
                 TURN_INDICATOR_Y - TURN_INDICATOR_RADIUS)
     
-        indicator = self.white_indicator if self.controller.board.turn == chess.WHITE else self.black_indicator
+        indicator = self.white_indicator if turn == chess.WHITE else self.black_indicator
         win.blit(indicator, top_left)
 
-    def draw_square_in_check(self, win):
-        for color in [chess.WHITE, chess.BLACK]:
-            king_square = self.controller.board.king(color)
-            if king_square is not None and self.controller.board.is_attacked_by(not color, king_square):
-                rank, file = king_square // 8, king_square % 8
-                row, col = (7 - rank, file) if self.controller.white_on_bottom else (rank, 7 - file)
-                rect = (BOARD_X + col * SQUARE_SIZE, BOARD_Y + row * SQUARE_SIZE, SQUARE_SIZE, SQUARE_SIZE)
-                pg.draw.rect(win, HIGHLIGHT_COLOR, rect)
-
-    def draw_made_move(self, win):
-        if self.controller.source_square_display and self.controller.target_square_display:
-            for sq in [self.controller.source_square_display, self.controller.target_square_display]:
-                rank, file = sq // 8, sq % 8
-                row, col = (7 - rank, file) if self.controller.white_on_bottom else (rank, 7 - file)
-                pg.draw.rect(win, RED, (BOARD_X + col * SQUARE_SIZE, BOARD_Y + row * SQUARE_SIZE, SQUARE_SIZE, SQUARE_SIZE), 5)
-
     def draw_board_background(self, win):
-        margin = 22
+        margin = BOARD_MARGIN
         rect = (BOARD_X - margin, BOARD_Y - margin, BOARD_WIDTH + 2*margin, BOARD_HEIGHT + 2*margin)
         pg.draw.rect(win, WHITE, rect)
\ No newline at end of file
@@ -1,7 +1,7 @@
 from config import *
 import pygame as pg
 import os
-from controller import get_resource_path
+from .asset_manager import assets
 
 class Button:
     def __init__(self, x, y, width, height, action, text, type = DEFAULT_BUTTON):
@@ -10,13 +10,14 @@ class Button:
         self.width = width
         self.height = height
         self.action = action
+        self.rect = pg.Rect(x, y, width, height)
         self.font = pg.font.SysFont('Consolas', int(height * 0.3), bold=False)
         self.message = self.font.render(text, True, BLACK)
         self.color = WHITE
 
-        image_path = get_resource_path(os.path.join('pics', type))
-        self.img = pg.transform.scale(pg.image.load(image_path), (self.width, self.height)).convert_alpha()
-        self.img.set_alpha(150) # ((150 / 256) * 100) % transparent
+        # Buttons of the same type and size share one surface
+        self.img = assets.get_scaled(os.path.join('pics', type), (self.width, self.height), smooth=False,
+                                     opacity=150) # ((150 / 256) * 100) % transparent
 
     def draw(self, win):
         pg.draw.rect(win, self.color, (self.x, self.y, self.width, self.height))
@@ -25,31 +26,15 @@ class Button:
                                 self.y + self.height // 2 - self.message.get_height() // 2))
         pg.draw.rect(win, BLACK, (self.x, self.y, self.width, self.height), 3)
 
-    def update_color_when_pressed(self, event, mouse_pos):
-        x, y = mouse_pos
-
-        # Check if mouse is hovering over the button
-        if self.x <= x <= self.x + self.width and \
-           self.y <= y <= self.y + self.height:
-            if event.type == pg.MOUSEBUTTONDOWN and event.button == 1: # Button is being held down
-                self.color = DARK_GRAY
-        else:
-            self.color = WHITE
-    
-
-    def is_clicked_mouseup_event(self, event, mouse_pos):
-        x = mouse_pos[0]
-        y = mouse_pos[1]
-
-        if self.x <= x <= self.x + self.width and \
-            self.y <= y <= self.y + self.height:
-            if event.type == pg.MOUSEBUTTONUP and event.button == 1:
-                return True
-            
-        return False
-    
-    def execute_command(self, event, mouse_pos):
-        if self.is_clicked_mouseup_event(event, mouse_pos):
+    def handle_mouse(self, event):
+        """ Button events over the button, routed here by the EventDispatcher """
+        if event.button != 1:
+            return
+        if event.type == pg.MOUSEBUTTONDOWN: # Button is being held down
+            self.color = DARK_GRAY
+        elif event.type == pg.MOUSEBUTTONUP:
             self.color = WHITE
             self.action()
 
+    def on_leave(self):
+        self.color = WHITE
@@ -0,0 +1,50 @@
+import pygame as pg
+from controller.profiler import profiler
+
+
+class DirtyRenderer:
+    """
+    Retained mode drawing. Every widget is drawn as a layer with a screen rect and a state key,
+    a layer is only restored from the background and redrawn when its key changed since the
+    last frame, and only those rects are sent to the display.
+    """
+    def __init__(self, background):
+        self.background = background
+        self.state_keys = {}  # layer name -> state key it was last drawn with
+        self.dirty_rects = []
+        self.full_redraw = True  # The first frame draws everything
+
+    def invalidate(self):
+        """ Redraw the whole window on the next frame (window exposed, overlays, ...) """
+        self.full_redraw = True
+
+    def begin_frame(self, win):
+        self.dirty_rects = []
+        if self.full_redraw:
+            win.blit(self.background, (0, 0))
+            self.state_keys.clear()
+
+    def draw_layer(self, win, name, rect, state, draw):
+        """ draw(win) is only called when state differs from the previous frame """
+        if name in self.state_keys and self.state_keys[name] == state:
+            return
+        self.state_keys[name] = state
+
+        with profiler.stage(f"draw {name}"):
+            if not self.full_redraw:
+                win.blit(self.background, rect, rect)
+                # Keep the widget inside its rect, whatever is outside would never be restored
+                win.set_clip(rect)
+                draw(win)
+                win.set_clip(None)
+                self.dirty_rects.append(pg.Rect(rect))
+            else:
+                draw(win)
+
+    def end_frame(self):
+        with profiler.stage("display update"):
+            if self.full_redraw:
+                pg.display.update()
+                self.full_redraw = False
+            elif self.dirty_rects:
+                pg.display.update(self.dirty_rects)
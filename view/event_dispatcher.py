@@ -0,0 +1,80 @@
+from config import *
+import pygame as pg
+
+
+class HitRegion:
+    """ Screen rect that gets the mouse button events over it """
+    def __init__(self, name, rect, handler, on_leave=None, enabled=None, priority=0):
+        self.name = name
+        self.rect = pg.Rect(rect)
+        self.handler = handler     # handler(event) for button down and up events
+        self.on_leave = on_leave   # on_leave() when the mouse is no longer over the region
+        self.enabled = enabled     # enabled() -> False while the region ignores the mouse, None is always enabled
+        self.priority = priority   # Overlapping regions: the highest priority gets the event
+
+    def is_enabled(self):
+        return self.enabled is None or self.enabled()
+
+
+class EventDispatcher:
+    """
+    Routes every mouse event only to the region under the cursor. Regions are listed in a grid of
+    HIT_TEST_CELL_SIZE cells, a lookup only checks the few regions of one cell however many are registered.
+    The dispatcher tracks which region the mouse is over and tells it when the mouse leaves.
+    """
+    def __init__(self, cell_size=HIT_TEST_CELL_SIZE):
+        self.cell_size = cell_size
+        self.regions = {}  # name -> region
+        self.grid = {}     # (column, row) -> regions touching the cell, highest priority first
+        self.hovered = None
+
+    def add_region(self, region):
+        if region.name in self.regions:
+            self.remove_region(region.name)
+        self.regions[region.name] = region
+        for cell in self.get_cells(region.rect):
+            regions = self.grid.setdefault(cell, [])
+            regions.append(region)
+            regions.sort(key=lambda other: -other.priority)
+
+    def remove_region(self, name):
+        region = self.regions.pop(name)
+        for cell in self.get_cells(region.rect):
+            self.grid[cell].remove(region)
+        if self.hovered is region:
+            self.hovered = None
+
+    def get_cells(self, rect):
+        for column in range(rect.left // self.cell_size, (rect.right - 1) // self.cell_size + 1):
+            for row in range(rect.top // self.cell_size, (rect.bottom - 1) // self.cell_size + 1):
+                yield column, row
+
+    def region_at(self, pos):
+        cell = (pos[0] // self.cell_size, pos[1] // self.cell_size)
+        for region in self.grid.get(cell, ()):
+            if region.rect.collidepoint(pos) and region.is_enabled():
+                return region
+        return None
+
+    def set_hovered(self, region):
+        if region is self.hovered:
+            return
+        if self.hovered is not None and self.hovered.on_leave is not None:
+            self.hovered.on_leave()
+        self.hovered = region
+
+    def dispatch(self, event):
+        """ Returns the region that handled the event, None when the event was not over any region """
+        if event.type == pg.WINDOWLEAVE:
+            self.set_hovered(None)
+            return None
+        if event.type not in (pg.MOUSEMOTION, pg.MOUSEBUTTONDOWN, pg.MOUSEBUTTONUP):
+            return None
+
+        region = self.region_at(event.pos)
+        self.set_hovered(region)
+        # Motion only changes the hover, handlers get the button events
+        if region is None or event.type == pg.MOUSEMOTION:
+            return None
+        region.handler(event)
+        return region
@@ -14,7 +14,12 @@ class GameStatusView:
         self.checkmate_black = self.font.render("Black won. Checkmate", True, BLACK)
         self.illegal_move_message = self.font.render("Not enought time. Engine suggested illegal move", True, BLACK)
         self.threefold_repetition_message = self.font.render("Draw by Threefold Repetition", True, BLACK)
+        self.tablebase_white_message = self.font.render("White won. Tablebase win", True, BLACK)
+        self.tablebase_black_message = self.font.render("Black won. Tablebase win", True, BLACK)
+        self.tablebase_draw_message = self.font.render("Draw by Tablebase", True, BLACK)
+        self.engine_not_started_message = self.font.render("Engine could not be started", True, BLACK)
         self.message = None
+        self.rect = pg.Rect(GAME_STATUS_X, GAME_STATUS_Y, GAME_STATUS_WIDTH, GAME_STATUS_HEIGHT)
 
     def draw(self, win, game_status):
         if game_status == PLAYING:
@@ -37,6 +42,14 @@ class GameStatusView:
             self.message = self.illegal_move_message
         elif game_status == THREEFOLD_REPETITION:
             self.message = self.threefold_repetition_message
+        elif game_status == TABLEBASE_WIN_WHITE:
+            self.message = self.tablebase_white_message
+        elif game_status == TABLEBASE_WIN_BLACK:
+            self.message = self.tablebase_black_message
+        elif game_status == TABLEBASE_DRAW:
+            self.message = self.tablebase_draw_message
+        elif game_status == ENGINE_NOT_STARTED:
+            self.message = self.engine_not_started_message
 
         # pg.draw.rect(win, BLACK, (GAME_STATUS_X, GAME_STATUS_Y, GAME_STATUS_WIDTH, GAME_STATUS_HEIGHT), 1)
         win.blit(self.message, (GAME_STATUS_X + GAME_STATUS_WIDTH // 2 - self.message.get_width() // 2,
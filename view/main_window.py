@@ -1,18 +1,31 @@
 from config import *
 import pygame as pg
 import threading
+import concurrent.futures
+import chess
+import time
 from controller.file_path import *
+from controller import BoardController
+from controller.startup_timeline import StartupTimeline
+from controller.profiler import profiler
 from .board_view import BoardView
+from .dirty_renderer import DirtyRenderer
+from .event_dispatcher import EventDispatcher
+from .sound_player import SoundPlayer
+from .asset_manager import assets
+from .asset_bundle import load_bundle, get_manifest
 
 class MainWindow:
     def __init__(self):
+        self.timeline = StartupTimeline()
         pg.init()
         self.width = SCREEN_WIDTH
         self.height = SCREEN_HEIGHT
         pg.display.set_caption("Cincinnatus GUI")
         
         # Create window immediately
-        self.window = pg.display.set_mode((self.width, self.height))
+        with self.timeline.stage("window"):
+            self.window = pg.display.set_mode((self.width, self.height))
         
         # Load the image and set it as the icon
         icon_path = get_resource_path(os.path.join("pics", "icon.png"))
@@ -22,10 +35,17 @@ class MainWindow:
         except pg.error:
             print(f"Could not find icon at {icon_path}")
 
+        # Pre-scaled images from build_assets.py, without it every image is decoded and scaled here
+        with self.timeline.stage("asset bundle"):
+            load_bundle(get_resource_path(ASSET_BUNDLE_FILE))
+
         # Setup loading state
         self.board_view = None
         self.loading_finished = threading.Event()
-        self.font = pg.font.SysFont("Consolas", 30)
+        # The default font needs no system font scan, that one runs in the loading thread
+        self.font = pg.font.Font(None, 30)
+        self.is_first_frame_drawn = False
+        self.is_startup_reported = False
 
         # Start the loading thread
         # daemon=True ensures the thread dies if you close the window
@@ -36,15 +56,59 @@ class MainWindow:
         # This keeps the splash screen drawing while the thread works
         self._run_splash()
 
-        raw_img = pg.image.load(get_resource_path(os.path.join("pics", "texture-background.bmp")))
-        converted_img = raw_img.convert()
-        self.background = pg.transform.scale(converted_img, (SCREEN_WIDTH, SCREEN_HEIGHT))  
+        self.background = assets.get_scaled(os.path.join("pics", "texture-background.bmp"), (SCREEN_WIDTH, SCREEN_HEIGHT),
+                                            alpha=False, smooth=False)
+        self.renderer = DirtyRenderer(self.background)
+
+        # Mouse events go straight to the widget under the cursor
+        self.dispatcher = EventDispatcher()
+        self.board_view.register_hit_regions(self.dispatcher)
+
+        # Engine threads post this to wake the main loop up while it sleeps
+        self.wake_up_event = pg.event.custom_type()
+        self.board_view.controller.on_update = self.post_wake_up
 
     def _load_task(self):
-        """This runs in the background. No pg.display calls allowed here"""
-        self.board_view = BoardView()
+        """
+        This runs in the background. No pg.display calls allowed here.
+        The engine handshake, sounds, images and fonts load at the same time, the views are
+        put together once the last of them is done. The engine may still be starting after that.
+        """
+        with concurrent.futures.ThreadPoolExecutor(max_workers=4, thread_name_prefix="startup") as executor:
+            controller_future = executor.submit(self._load_controller)
+            images_future = executor.submit(self._load_images)
+            fonts_future = executor.submit(self._load_fonts)
+            sounds_future = executor.submit(self._load_sounds)
+            images_future.result()
+            fonts_future.result()
+            controller = controller_future.result()
+            # Nothing is played before the views exist
+            controller.sounds = sounds_future.result()
+
+        with self.timeline.stage("views"):
+            self.board_view = BoardView(controller)
         self.loading_finished.set()
 
+    def _load_controller(self):
+        with self.timeline.stage("controller"):
+            return BoardController(wait_for_engine=False, timeline=self.timeline)
+
+    def _load_sounds(self):
+        with self.timeline.stage("sounds"):
+            return SoundPlayer()
+
+    def _load_images(self):
+        # Hits the asset manager when the bundle was loaded, decodes and scales otherwise
+        with self.timeline.stage("images"):
+            for relative_path, size, alpha, smooth, opacity in get_manifest():
+                assets.get_scaled(relative_path, size, alpha, smooth, opacity)
+
+    def _load_fonts(self):
+        # The first SysFont call scans the installed fonts, the views only create fonts after it
+        with self.timeline.stage("fonts"):
+            pg.font.init()
+            pg.font.SysFont("Consolas", 30)
+
     def _run_splash(self):
         """The Main Thread loop that prevents the 'Black Screen'."""
         clock = pg.time.Clock()
@@ -72,10 +136,79 @@ class MainWindow:
             clock.tick(FPS)
 
     def draw(self):
-        # self.window.fill(BACKGROUND_COLOR)
-        self.window.blit(self.background, (0, 0))
-        self.board_view.draw(self.window)
-        pg.display.update()  # Update the display
+        # Only the widgets that changed are redrawn and pushed to the display
+        self.board_view.draw(self.window, self.renderer)
+
+    def report_startup(self, ctrl):
+        if self.is_startup_reported:
+            return
+        if not self.is_first_frame_drawn:
+            self.timeline.mark("first frame")
+            self.is_first_frame_drawn = True
+        # Printed once the engine is ready too, it usually comes last
+        if ctrl.engine_start is None or ctrl.engine_start.done():
+            self.timeline.report()
+            self.is_startup_reported = True
+
+    def post_wake_up(self):
+        try:
+            pg.event.post(pg.event.Event(self.wake_up_event))
+        except pg.error:
+            pass # Window is already closed
+
+    def get_idle_timeout(self, ctrl):
+        """ None while something must be updated every frame, else the milliseconds the loop may sleep """
+        if ctrl.active_animation is not None or ctrl.pending_move is not None:
+            return None
+        if ctrl.game_status != PLAYING:
+            return self.get_max_wait()
+
+        # The engine has to be asked for a move as soon as possible
+        is_engine_turn = (ctrl.white_on_bottom and ctrl.board.turn == chess.BLACK) or \
+                         (not ctrl.white_on_bottom and ctrl.board.turn == chess.WHITE)
+        if is_engine_turn and not ctrl.is_engine_thinking:
+            return None
+
+        # Wake up when the running clock shows the next second, clocks are shown rounded
+        running_clock = ctrl.white_clock if ctrl.board.turn == chess.WHITE else ctrl.black_clock
+        next_second = running_clock - (round(running_clock) - 0.5)
+        # ... or when it runs out, even if the display already shows 00:00
+        wait = min(next_second, running_clock)
+        return max(1, min(self.get_max_wait(), int(wait * 1000) + 1))
+
+    def get_max_wait(self):
+        # The profiler overlay refreshes on its own
+        if profiler.enabled:
+            return min(IDLE_MAX_WAIT_MS, int(PROFILER_REFRESH * 1000))
+        return IDLE_MAX_WAIT_MS
+
+    def wait_for_events(self, ctrl, clock):
+        """
+        Full FPS while pieces move or the engine must start, otherwise sleep until an event,
+        the next clock second or a wake up from the engine. Returns (dt, events)
+        """
+        timeout = self.get_idle_timeout(ctrl)
+        if timeout is None:
+            dt = clock.tick(FPS) / 1000.0
+            return dt, pg.event.get()
+
+        event = pg.event.wait(timeout)
+        events = [] if event.type == pg.NOEVENT else [event]
+        events.extend(pg.event.get())
+        # An animation started while sleeping begins with one normal frame, not with the whole sleep
+        clock.tick()
+        return 1.0 / FPS, events
+
+    def handle_profiler_keys(self, event):
+        if event.key == pg.K_F3:
+            profiler.set_enabled(not profiler.enabled)
+        elif event.key == pg.K_F4:
+            trace_path = get_resource_path(f"trace-{time.strftime('%Y%m%d-%H%M%S')}.json")
+            try:
+                event_num = profiler.dump_chrome_trace(trace_path)
+                print(f"Wrote {event_num} profiler events to: {trace_path}")
+            except OSError as e:
+                print(f"Could not write profiler trace to {trace_path}: {e}")
 
     def run(self):
         clock = pg.time.Clock()
@@ -83,45 +216,48 @@ class MainWindow:
         ctrl = self.board_view.controller
     
         while running:
-            dt = clock.tick(FPS) / 1000.0 
-            mouse_pos = pg.mouse.get_pos()
+            with profiler.stage("idle wait"):
+                dt, events = self.wait_for_events(ctrl, clock)
+            frame_start = time.perf_counter()
     
             # PROCESS ANIMATIONS
-            ctrl.procces_animation_and_push_move(dt)
+            with profiler.stage("animation"):
+                ctrl.procces_animation_and_push_move(dt)
     
             # PROCESS EVENTS (ONE LOOP ONLY)
-            for event in pg.event.get():
-                if event.type == pg.QUIT:
-                    running = False
-                    with ctrl.board_lock:
-                        ctrl.is_force_quit_engine = True
-    
-                # Handle UI Buttons
-                self.board_view.change_side_button.update_color_when_pressed(event, mouse_pos)
-                self.board_view.change_side_button.execute_command(event, mouse_pos)
-                self.board_view.one_minutes_button.update_color_when_pressed(event, mouse_pos)
-                self.board_view.one_minutes_button.execute_command(event, mouse_pos)
-                self.board_view.five_minutes_button.update_color_when_pressed(event, mouse_pos)
-                self.board_view.five_minutes_button.execute_command(event, mouse_pos)
-                self.board_view.ten_minutes_button.update_color_when_pressed(event, mouse_pos)
-                self.board_view.ten_minutes_button.execute_command(event, mouse_pos)
-                self.board_view.pause_button.update_color_when_pressed(event, mouse_pos)
-                self.board_view.pause_button.execute_command(event, mouse_pos)
-                self.board_view.play_button.update_color_when_pressed(event, mouse_pos)
-                self.board_view.play_button.execute_command(event, mouse_pos)
+            with profiler.stage("events"):
+                for event in events:
+                    if event.type == pg.QUIT:
+                        running = False
+                        with ctrl.board_lock:
+                            ctrl.is_force_quit_engine = True
+
+                    if event.type == pg.KEYDOWN:
+                        self.handle_profiler_keys(event)
+
+                    # The window content may be lost when it was covered or minimized
+                    if event.type in (pg.VIDEOEXPOSE, pg.WINDOWEXPOSED, pg.WINDOWRESTORED, pg.WINDOWSIZECHANGED):
+                        self.renderer.invalidate()
     
-                # Handle Board Interactions
-                if ctrl.is_promoting:
-                    ctrl.choose_promotion_piece(event, mouse_pos)
-                else:
-                    ctrl.handle_click(event, mouse_pos)
-                # They are separate because promoting piece has its logic and it pushes the move
-                # The animation 
+                    # Buttons, board and promotion table, only the one under the mouse gets the event
+                    self.dispatcher.dispatch(event)
+
+            # Clocks first, the frame and the next idle timeout use the time of this wake up
+            with profiler.stage("update_time"):
+                ctrl.update_time()
 
             #  RENDER & UPDATES
-            self.draw()
-            ctrl.update_time()
-            ctrl.engine_make_move()
+            # The views draw this snapshot, board_lock is only held while it is copied
+            with profiler.stage("publish state"):
+                ctrl.publish_state()
+            with profiler.stage("draw"):
+                self.draw()
+            self.report_startup(ctrl)
+            with profiler.stage("engine_make_move"):
+                ctrl.engine_make_move()
+
+            if profiler.enabled:
+                profiler.record("frame", frame_start, time.perf_counter() - frame_start)
     
         pg.quit()
         ctrl.shut_down_engine()
\ No newline at end of file
@@ -2,6 +2,8 @@ import pygame as pg
 import os
 from controller import get_resource_path
 from config import *
+from .text_cache import text_cache
+from .asset_manager import assets
 
 class MaterialScoreTableView:
     def __init__(self):
@@ -10,6 +12,8 @@ class MaterialScoreTableView:
         
         self.pieces_material_images = {}
         self.piece_img_coords = {}
+        # Column of icons plus the "2x" counters written left of them
+        self.rect = pg.Rect(0, MATERIAL_SCORE_Y, MATERIAL_SCORE_X + MATERIAL_SCORE_WIDTH + 1, BOARD_HEIGHT)
         
         self.load_resources()
 
@@ -42,38 +46,40 @@ class MaterialScoreTableView:
                 print(f"Warning: Missing material icon for {symbol} at {path}")
                 continue
 
-            #  Load, convert, and scale
-            img = pg.image.load(path).convert_alpha()
-            self.pieces_material_images[symbol] = pg.transform.smoothscale(
-                img, (MATERIAL_SCORE_WIDTH, MATERIAL_SCORE_WIDTH)
+            # Scaled variant from the shared asset manager
+            self.pieces_material_images[symbol] = assets.get_scaled(
+                os.path.join('pics', filename), (MATERIAL_SCORE_WIDTH, MATERIAL_SCORE_WIDTH)
             )
 
             # Store coordinates
             self.piece_img_coords[symbol] = (MATERIAL_SCORE_X, y_coords[symbol])
 
-    def draw_piece_material(self, win, piece_char, num):
-        """Draws the piece icon and the quantity multiplier (e.g., 2x)."""
+    def get_piece_material_blits(self, piece_char, num):
+        """The piece icon and the quantity multiplier (e.g., 2x), as (surface, position) pairs."""
         if num <= 0:
-            return
+            return []
 
         img = self.pieces_material_images[piece_char]
         coords = self.piece_img_coords[piece_char]
         
-        # 1. Draw the piece icon
-        win.blit(img, coords)
+        # 1. The piece icon
+        blits = [(img, coords)]
 
-        # 2. Draw the multiplier text (only if > 1)
+        # 2. The multiplier text (only if > 1)
         if num > 1:
             text_str = f"{num}x"
-            message = self.font.render(text_str, True, BLACK)
+            message = text_cache.render(self.font, text_str, BLACK)
             
             # Position text to the left of the image, vertically centered
             text_x = coords[0] - message.get_width() - 5  # 5px padding
             text_y = coords[1] + (img.get_height() // 2) - (message.get_height() // 2)
-            win.blit(message, (text_x, text_y))
+            blits.append((message, (text_x, text_y)))
+        return blits
 
     def draw(self, win, absent_pieces_map):
-        """Matches BoardView's signature, iterating through the pieces."""
+        """Matches BoardView's signature, every icon and counter goes to the window in one blits call."""
+        sequence = []
         for symbol in self.piece_img_coords.keys():
             quantity = absent_pieces_map.get(symbol, 0)
-            self.draw_piece_material(win, symbol, quantity)
\ No newline at end of file
+            sequence += self.get_piece_material_blits(symbol, quantity)
+        win.blits(sequence, doreturn=False)
@@ -0,0 +1,43 @@
+from config import *
+import pygame as pg
+from controller.profiler import profiler
+from .text_cache import text_cache
+
+
+class ProfilerOverlay:
+    """ Stage percentiles in the strip above the board, refreshed every PROFILER_REFRESH seconds """
+    def __init__(self):
+        self.rect = pg.Rect(PROFILER_OVERLAY_X, PROFILER_OVERLAY_Y, PROFILER_OVERLAY_WIDTH, PROFILER_OVERLAY_HEIGHT)
+        self.font = pg.font.SysFont('Consolas', 13, bold=False)
+        self.line_height = self.font.get_linesize()
+        self.column_width = 365
+        self.background = pg.Surface(self.rect.size, pg.SRCALPHA)
+        self.background.fill((0, 0, 0, 170))
+
+    def get_state(self, now):
+        """ State key for the dirty renderer, it changes once per refresh while the overlay is shown """
+        if not profiler.enabled:
+            return None
+        return int(now / PROFILER_REFRESH)
+
+    def draw(self, win):
+        if not profiler.enabled:
+            return
+
+        win.blit(self.background, self.rect.topleft)
+        header = "Profiler (ms)     p50    p95    max      n   | F3 hide, F4 dump trace"
+        win.blit(text_cache.render(self.font, header, HIGHLIGHT_COLOR), (self.rect.x + 5, self.rect.y + 3))
+
+        x, y = self.rect.x + 5, self.rect.y + 3 + self.line_height
+        for name, (count, p50, p95, maximum) in sorted(profiler.stats().items()):
+            if y + self.line_height > self.rect.bottom:
+                # Next column
+                x += self.column_width
+                y = self.rect.y + 3 + self.line_height
+                if x + self.column_width > self.rect.right:
+                    return
+
+            # Numbers change every refresh, rendered directly instead of filling the shared text cache
+            line = f"{name[:16]:<16}{p50:6.2f} {p95:6.2f} {maximum:6.2f} {count:6d}"
+            win.blit(self.font.render(line, True, WHITE), (x, y))
+            y += self.line_height
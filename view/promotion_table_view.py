@@ -3,6 +3,7 @@ import os
 import chess
 from controller import get_resource_path
 from config import *
+from .asset_manager import assets
 
 class PromotionTableView:
     def __init__(self):
@@ -28,20 +29,24 @@ class PromotionTableView:
                 print(f"Error: Promotion image missing at {path}")
                 continue
 
-            # 3. Load, convert, and scale
-            img = pg.image.load(path).convert_alpha()
-            self.pieces_promotion_images[symbol] = pg.transform.smoothscale(
-                img, (PROMOTION_TABLE_CELL_WIDTH, PROMOTION_TABLE_CELL_HEIGHT)
+            # 3. Scaled variant from the shared asset manager
+            self.pieces_promotion_images[symbol] = assets.get_scaled(
+                os.path.join('pics', filename), (PROMOTION_TABLE_CELL_WIDTH, PROMOTION_TABLE_CELL_HEIGHT)
             )
 
+    def create_overlay(self):
+        overlay = pg.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pg.SRCALPHA)
+        overlay.fill(PROMOTION_OVERLAY_COLOR)  # Semi-transparent black
+        return overlay
+
     def draw(self, win, is_promoting, turn):
         if not is_promoting:
             return
 
         # 1. Dim the background slightly to highlight the promotion choice
         # This creates a "modal" feel
-        overlay = pg.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pg.SRCALPHA)
-        overlay.fill((0, 0, 0, 30))  # Semi-transparent black
+        overlay = assets.get_sprite(("modal overlay", (SCREEN_WIDTH, SCREEN_HEIGHT), PROMOTION_OVERLAY_COLOR),
+                                    self.create_overlay)
         win.blit(overlay, (0, 0))
 
         # 2. Select pieces based on turn
@@ -1,12 +1,19 @@
 from config import *
 from controller.search_info import SearchInfo
 import pygame as pg
+from collections import OrderedDict
+from .text_cache import text_cache
 
 class SearchInfoView:
     def __init__(self):
         self.search_info = None
+        self.rect = pg.Rect(SEARCH_INFO_X, SEARCH_INFO_Y, SEARCH_INFO_WIDTH, SEARCH_INFO_HEIGHT)
         self.font_size = int(SQUARE_SIZE * 0.3)
         self.font = pg.font.SysFont('Consolas', self.font_size, bold=False)
+        # Background, frame and corners, they never change. The corner lines overhang self.rect,
+        # draw_rect covers them too
+        self.chrome, self.draw_rect = self.build_chrome()
+        self.wrapped_lines = OrderedDict() # (PV tuple, width) -> lines of text
 
     def draw_box(self, win):
         # Define the inner gap (twice smaller than GAP_INFO)
@@ -24,57 +31,78 @@ class SearchInfoView:
         pg.draw.line(win, BLACK, (x + 1, y + h - 1), (x + sg, y + h - sg), 2) # Bottom-Left
         pg.draw.line(win, BLACK, (x + w - 1, y + h - 1), (x + w - sg, y + h - sg), 2) # Bottom-Right
 
+    def build_chrome(self):
+        """ Chrome surface and the window rect it covers, pixels left undrawn are transparent """
+        canvas = pg.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+        canvas.fill(CHROME_COLOR_KEY)
+        canvas.set_colorkey(CHROME_COLOR_KEY)
+        pg.draw.rect(canvas, WHITE, (SEARCH_INFO_X, SEARCH_INFO_Y, SEARCH_INFO_WIDTH, SEARCH_INFO_HEIGHT))
+        self.draw_box(canvas)
+        pg.draw.rect(canvas, BLACK, (SEARCH_INFO_X, SEARCH_INFO_Y, SEARCH_INFO_WIDTH, SEARCH_INFO_HEIGHT), 2)
+        draw_rect = canvas.get_bounding_rect()
+        return canvas.subsurface(draw_rect).copy(), draw_rect
+
     def draw(self, win, search_info):
-        pg.draw.rect(win, WHITE, (SEARCH_INFO_X, SEARCH_INFO_Y, SEARCH_INFO_WIDTH, SEARCH_INFO_HEIGHT))
-        self.draw_box(win)
-        pg.draw.rect(win, BLACK, (SEARCH_INFO_X, SEARCH_INFO_Y, SEARCH_INFO_WIDTH, SEARCH_INFO_HEIGHT), 2)
+        win.blit(self.chrome, self.draw_rect)
 
         current_y = SEARCH_INFO_Y + GAP_INFO
         max_w = SEARCH_INFO_WIDTH - (GAP_INFO * 2)
 
         # 2. Draw Depth
         if search_info.depth != None:
-            depth_surf = self.font.render(f"Depth {search_info.depth}", True, BLACK)
+            depth_surf = text_cache.render(self.font, f"Depth {search_info.depth}", BLACK)
             win.blit(depth_surf, (SEARCH_INFO_X + GAP_INFO, current_y))
             current_y += depth_surf.get_height()
 
         # 3. Draw Eval
         if search_info.eval != None:
             if search_info.eval < 0:
-                eval_surf = self.font.render(f"Eval {search_info.eval}. The player has adventage", True, BLACK)
+                eval_surf = text_cache.render(self.font, f"Eval {search_info.eval}. The player has adventage", BLACK)
             elif search_info.eval > 0:
-                eval_surf = self.font.render(f"Eval {search_info.eval}. The engine has adventage", True, BLACK)
+                eval_surf = text_cache.render(self.font, f"Eval {search_info.eval}. The engine has adventage", BLACK)
             else:
-                eval_surf = self.font.render(f"Eval {search_info.eval}", True, BLACK)
+                eval_surf = text_cache.render(self.font, f"Eval {search_info.eval}", BLACK)
             win.blit(eval_surf, (SEARCH_INFO_X + GAP_INFO, current_y))
             current_y += eval_surf.get_height() + 5
 
         # 4. Draw Principle Variation (PV) with Auto-Wrap
         if search_info.principle_variation != None:
-            pv_list = [move.uci() for move in search_info.principle_variation]
-            
-            line_text = "PV "
-            for move in pv_list:
-                # Test if adding the next move exceeds the width
-                test_line = line_text + move + " "
-                test_size = self.font.size(test_line)[0]
-
-                if test_size < max_w:
-                    line_text = test_line
-                else:
-                    # Render current line and start a new one
-                    pv_surf = self.font.render(line_text, True, BLACK)
-                    win.blit(pv_surf, (SEARCH_INFO_X + GAP_INFO, current_y))
-                    
-                    current_y += pv_surf.get_height()
-                    line_text = move + " " # Start new line with the move that didn't fit
-
-                    # Safety check: Stop drawing if we exceed the box height
-                    if current_y + self.font_size > SEARCH_INFO_Y + SEARCH_INFO_HEIGHT:
-                        return
-
-            # Render the final remaining bit of text
-            if line_text:
-                final_pv_surf = self.font.render(line_text, True, BLACK)
-                win.blit(final_pv_surf, (SEARCH_INFO_X + GAP_INFO, current_y))
+            for line_text in self.wrap_principle_variation(search_info.principle_variation, max_w):
+                pv_surf = text_cache.render(self.font, line_text, BLACK)
+                win.blit(pv_surf, (SEARCH_INFO_X + GAP_INFO, current_y))
+                current_y += pv_surf.get_height()
+
+                # Safety check: Stop drawing if we exceed the box height
+                if current_y + self.font_size > SEARCH_INFO_Y + SEARCH_INFO_HEIGHT:
+                    return
+
+    def wrap_principle_variation(self, principle_variation, max_w):
+        """ Lines of the PV that fit in max_w pixels, remembered per (PV, width) """
+        key = (principle_variation, max_w)
+        lines = self.wrapped_lines.get(key)
+        if lines is not None:
+            self.wrapped_lines.move_to_end(key)
+            return lines
+
+        lines = []
+        line_text = "PV "
+        for move in principle_variation:
+            # Test if adding the next move exceeds the width
+            test_line = line_text + move.uci() + " "
+            test_size = self.font.size(test_line)[0]
+
+            if test_size < max_w:
+                line_text = test_line
+            else:
+                lines.append(line_text)
+                line_text = move.uci() + " " # Start new line with the move that didn't fit
+
+        # The final remaining bit of text
+        if line_text:
+            lines.append(line_text)
 
+        lines = tuple(lines)
+        self.wrapped_lines[key] = lines
+        while len(self.wrapped_lines) > PV_WRAP_CACHE_SIZE:
+            self.wrapped_lines.popitem(last=False)
+        return lines
@@ -0,0 +1,21 @@
+import os
+import pygame as pg
+from controller import get_resource_path
+
+
+class SoundPlayer:
+    """ The controller's sound adapter for the GUI, plays the sounds through the pygame mixer """
+    def __init__(self):
+        pg.mixer.init()
+        self.move_sound = pg.mixer.Sound(get_resource_path(os.path.join("sounds", "move.mp3")))
+        self.capture_sound = pg.mixer.Sound(get_resource_path(os.path.join("sounds", "capture.mp3")))
+        self.generic_notification_sound = pg.mixer.Sound(get_resource_path(os.path.join("sounds", "generic_notification.mp3")))
+
+    def play_move(self):
+        self.move_sound.play()
+
+    def play_capture(self):
+        self.capture_sound.play()
+
+    def play_notification(self):
+        self.generic_notification_sound.play()
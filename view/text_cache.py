@@ -0,0 +1,48 @@
+from collections import OrderedDict
+from config import *
+
+
+class TextCache:
+    """
+    Bounded LRU cache of rendered text surfaces keyed by (font, text, color, antialias).
+    Shared by all views and only used from the drawing thread, so it has no lock.
+    The returned surfaces are shared too, never draw on them.
+    """
+    def __init__(self, max_size=TEXT_CACHE_SIZE):
+        self.max_size = max_size
+        self.entries = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font, text, color, antialias=True):
+        """ Same as font.render(text, antialias, color) """
+        key = (font, text, tuple(color), antialias)
+        surface = self.entries.get(key)
+        if surface is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = font.render(text, antialias, color)
+        self.entries[key] = surface
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+        return surface
+
+    def clear(self):
+        self.entries.clear()
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "size": len(self.entries),
+            "max_size": self.max_size,
+        }
+
+
+text_cache = TextCache()
@@ -1,10 +1,13 @@
 from config import *
 import pygame as pg
+from .text_cache import text_cache
 
 class TimeView:
     def __init__(self):
         self.font = pg.font.SysFont("Consolas", int(TIME_INFO_HEIGHT * 0.4), bold=True)
         self.gap = 7
+        self.rect = pg.Rect(TIME_INFO_X, TIME_INFO_Y, TIME_INFO_WIDTH, TIME_INFO_HEIGHT)
+        self.frame = None
         self.collor_gap = 50
         self.white_darker_color = (max(0, WHITE_SQUARE_COLOR[0] - self.collor_gap), max(0, WHITE_SQUARE_COLOR[1] - self.collor_gap), max(0, WHITE_SQUARE_COLOR[2] - self.collor_gap))
         self.black_darker_color = (max(0, BLACK_SQUARE_COLOR[0] - self.collor_gap), max(0, BLACK_SQUARE_COLOR[1] - self.collor_gap), max(0, BLACK_SQUARE_COLOR[2] - self.collor_gap))
@@ -46,30 +49,38 @@ class TimeView:
         # Bottom-Right
         pg.draw.line(win, BLACK, (x_b + w - 1, y + h - 1), (x_b + w - g, y + h - g), 2)
 
-    def draw(self, win, white_clock, black_clock):
-        white_time = self.font.render(self.format_time(white_clock), True, BLACK)
-        black_time = self.font.render(self.format_time(black_clock), True, BLACK)
-
-        pg.draw.rect(win, self.white_darker_color, (TIME_INFO_X, TIME_INFO_Y, TIME_INFO_CELL_WIDTH, TIME_INFO_HEIGHT)) # outer rect
-        pg.draw.rect(win, WHITE_SQUARE_COLOR, 
-                     (TIME_INFO_X + self.gap, TIME_INFO_Y + self.gap, TIME_INFO_CELL_WIDTH - 2 * self.gap, TIME_INFO_HEIGHT - 2 * self.gap)) # inner rect
-        pg.draw.rect(win, BLACK, 
-                     (TIME_INFO_X + self.gap, TIME_INFO_Y + self.gap, TIME_INFO_CELL_WIDTH - 2 * self.gap, TIME_INFO_HEIGHT - 2 * self.gap), 2) # inner rect
+    def get_frame(self):
+        """ Both cells without the clock text. Built once, it never changes """
+        if self.frame is None:
+            win = pg.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+            pg.draw.rect(win, self.white_darker_color, (TIME_INFO_X, TIME_INFO_Y, TIME_INFO_CELL_WIDTH, TIME_INFO_HEIGHT)) # outer rect
+            pg.draw.rect(win, WHITE_SQUARE_COLOR, 
+                         (TIME_INFO_X + self.gap, TIME_INFO_Y + self.gap, TIME_INFO_CELL_WIDTH - 2 * self.gap, TIME_INFO_HEIGHT - 2 * self.gap)) # inner rect
+            pg.draw.rect(win, BLACK, 
+                         (TIME_INFO_X + self.gap, TIME_INFO_Y + self.gap, TIME_INFO_CELL_WIDTH - 2 * self.gap, TIME_INFO_HEIGHT - 2 * self.gap), 2) # inner rect
+
+            pg.draw.rect(win, self.black_darker_color, (TIME_INFO_X + TIME_INFO_CELL_WIDTH, TIME_INFO_Y, TIME_INFO_CELL_WIDTH, TIME_INFO_HEIGHT)) # outer rect
+            pg.draw.rect(win, BLACK_SQUARE_COLOR, 
+                         (TIME_INFO_X + TIME_INFO_CELL_WIDTH + self.gap, TIME_INFO_Y + self.gap, TIME_INFO_CELL_WIDTH - 2 * self.gap, TIME_INFO_HEIGHT - 2 * self.gap)) # inner rect
+            pg.draw.rect(win, BLACK, 
+                         (TIME_INFO_X + TIME_INFO_CELL_WIDTH + self.gap, TIME_INFO_Y + self.gap, TIME_INFO_CELL_WIDTH - 2 * self.gap, TIME_INFO_HEIGHT - 2 * self.gap), 2) # inner rect
+
+            self.draw_edge_corners(win)
+
+            pg.draw.line(win, BLACK, (TIME_INFO_X + TIME_INFO_CELL_WIDTH, TIME_INFO_Y), (TIME_INFO_X + TIME_INFO_CELL_WIDTH, TIME_INFO_Y + TIME_INFO_HEIGHT - 1), 1)
+            pg.draw.rect(win, BLACK, (TIME_INFO_X, TIME_INFO_Y, TIME_INFO_WIDTH, TIME_INFO_HEIGHT), 3)
+            self.frame = win.subsurface(self.rect).copy()
+        return self.frame
 
-        pg.draw.rect(win, self.black_darker_color, (TIME_INFO_X + TIME_INFO_CELL_WIDTH, TIME_INFO_Y, TIME_INFO_CELL_WIDTH, TIME_INFO_HEIGHT)) # outer rect
-        pg.draw.rect(win, BLACK_SQUARE_COLOR, 
-                     (TIME_INFO_X + TIME_INFO_CELL_WIDTH + self.gap, TIME_INFO_Y + self.gap, TIME_INFO_CELL_WIDTH - 2 * self.gap, TIME_INFO_HEIGHT - 2 * self.gap)) # inner rect
-        pg.draw.rect(win, BLACK, 
-                     (TIME_INFO_X + TIME_INFO_CELL_WIDTH + self.gap, TIME_INFO_Y + self.gap, TIME_INFO_CELL_WIDTH - 2 * self.gap, TIME_INFO_HEIGHT - 2 * self.gap), 2) # inner rect
+    def draw(self, win, white_clock, black_clock):
+        white_time = text_cache.render(self.font, self.format_time(white_clock), BLACK)
+        black_time = text_cache.render(self.font, self.format_time(black_clock), BLACK)
 
+        # The text sits inside the inner rects, so it can go on top of the finished frame
+        win.blit(self.get_frame(), self.rect)
 
         win.blit(white_time, (TIME_INFO_X + TIME_INFO_CELL_WIDTH // 2 - white_time.get_width() // 2,
                                TIME_INFO_Y + TIME_INFO_HEIGHT // 2 - white_time.get_height() // 2))
         
         win.blit(black_time, (TIME_INFO_X + TIME_INFO_CELL_WIDTH + TIME_INFO_CELL_WIDTH // 2 - black_time.get_width() // 2,
                                TIME_INFO_Y + TIME_INFO_HEIGHT // 2 - black_time.get_height() // 2))
-
-        self.draw_edge_corners(win)
-
-        pg.draw.line(win, BLACK, (TIME_INFO_X + TIME_INFO_CELL_WIDTH, TIME_INFO_Y), (TIME_INFO_X + TIME_INFO_CELL_WIDTH, TIME_INFO_Y + TIME_INFO_HEIGHT - 1), 1)
-        pg.draw.rect(win, BLACK, (TIME_INFO_X, TIME_INFO_Y, TIME_INFO_WIDTH, TIME_INFO_HEIGHT), 3)